@@ -0,0 +1,170 @@
+# Read-only drift audit of a Hawkular Alerts tenant, run on the controller
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import os
+import imp
+from multiprocessing.pool import ThreadPool
+
+import yaml
+
+from ansible.errors import AnsibleError
+from ansible.module_utils._text import to_text
+from ansible.module_utils.parsing.convert_bool import boolean
+from ansible.plugins.action import ActionBase
+
+imp.load_source('hawkular_alerts_path', os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                                    'module_utils', 'hawkular_alerts_path.py'))
+
+from ansible.module_utils.hawkular_alerts import PluginModule, create_rate_limiter, load_library_module, ssl_context
+
+
+class ActionModule(ActionBase):
+
+    TRANSFERS_FILES = False
+
+    def audit_group(self, group, connection, client_options):
+        """ Compares a group of the spec file with the live group trigger,
+            its conditions, dampenings and members, without writing anything
+
+            Returns:
+                Hash (dictionary) of the differences, empty if there are none
+        """
+        import urllib2
+        trigger_module   = load_library_module('hawkular_alerts_group_trigger')
+        dampening_module = load_library_module('hawkular_alerts_group_dampening')
+        member_module    = load_library_module('hawkular_alerts_group_member')
+        group_trigger    = trigger_module.HawkularAlertsGroupTrigger(PluginModule(), *connection, **client_options)
+        group_dampening  = dampening_module.HawkularAlertsGroupDampening(PluginModule(), *connection, **client_options)
+        group_member     = member_module.HawkularAlertsGroupMember(PluginModule(), *connection, **client_options)
+
+        group_id = group['group_id']
+        differences = {}
+        try:
+            trigger = group_trigger.client.get_trigger(group_id)
+        except urllib2.HTTPError as e:
+            if e.code == 404:
+                return dict(missing=True)
+            raise
+
+        # the same defaults as the hawkular_alerts_group_trigger module
+        severity = group.get('severity')
+        updates = group_trigger.required_updates(trigger, {"name": group.get('name'),
+                                                           "event_text": group.get('event_text'),
+                                                           "severity": severity and severity.upper(),
+                                                           "auto_resolve": group.get('auto_resolve', False),
+                                                           "tags": group.get('tags'),
+                                                           "enabled": group.get('enabled', True)})
+        if updates:
+            differences['trigger_updates'] = updates
+        if group.get('conditions') is not None and \
+                group_trigger.conditions_update_required(group_id, group['conditions']):
+            differences['conditions'] = True
+
+        if group.get('dampenings'):
+            current_dampenings_by_trigger_mode = group_dampening.get_group_dampenings(group_id)
+            dampening_differences = {}
+            for trigger_mode, desired_dampening in group['dampenings'].items():
+                if trigger_mode not in current_dampenings_by_trigger_mode:
+                    dampening_differences[trigger_mode] = 'missing'
+                elif group_dampening.update_required(desired_dampening, current_dampenings_by_trigger_mode[trigger_mode]):
+                    dampening_differences[trigger_mode] = 'update required'
+            if dampening_differences:
+                differences['dampenings'] = dampening_differences
+
+        if group.get('members') is not None:
+            desired_member_ids = set(member['id'] for member in group['members'])
+            current_member_ids = set(member.id for member in
+                                     group_member.client.list_trigger_records(['triggers', 'groups', group_id, 'members']))
+            if desired_member_ids - current_member_ids:
+                differences['missing_members'] = sorted(desired_member_ids - current_member_ids)
+            if current_member_ids - desired_member_ids:
+                differences['unmanaged_members'] = sorted(current_member_ids - desired_member_ids)
+        return differences
+
+    def run(self, tmp=None, task_vars=None):
+        result = super(ActionModule, self).run(tmp, task_vars)
+        del tmp
+
+        args       = self._task.args
+        hostname   = args.get('hawkular_api_hostname', os.environ.get('HAWKULAR_HOSTNAME'))
+        port       = args.get('hawkular_api_port', os.environ.get('HAWKULAR_PORT'))
+        token      = args.get('hawkular_api_auth_token', os.environ.get('HAWKULAR_TOKEN'))
+        tenant     = args.get('tenant')
+        spec_file  = args.get('spec_file')
+        workers    = int(args.get('concurrency', 10))
+        scheme     = args.get('scheme', 'https')
+        verify_ssl = args.get('verify_ssl', True)
+        ca_file    = args.get('ca_file_path')
+        max_rate   = args.get('max_requests_per_second')
+        rate_file  = args.get('rate_limit_file')
+
+        for arg, value in [('hawkular_api_hostname', hostname), ('hawkular_api_port', port),
+                           ('hawkular_api_auth_token', token), ('tenant', tenant), ('spec_file', spec_file)]:
+            if value in (None, ''):
+                result.update(failed=True, msg="missing required argument: {}".format(arg))
+                return result
+
+        try:
+            verify_ssl = boolean(verify_ssl)
+        except TypeError:
+            result.update(failed=True, msg="verify_ssl must be a boolean, got: {value}".format(value=verify_ssl))
+            return result
+
+        try:
+            with open(self._find_needle('files', spec_file)) as f:
+                spec = yaml.safe_load(f)
+        except (AnsibleError, IOError, yaml.YAMLError) as e:
+            result.update(failed=True, msg="Failed to read spec file {path}. Error: {error}".format(
+                path=spec_file, error=to_text(e)))
+            return result
+        if not isinstance(spec, dict) or not isinstance(spec.get('groups'), list):
+            result.update(failed=True, msg="Spec file {path} must hold a mapping with a groups list".format(
+                path=spec_file))
+            return result
+        groups = spec['groups']
+        if not all(isinstance(group, dict) and group.get('group_id') for group in groups):
+            result.update(failed=True, msg="Each group of spec file {path} must be a mapping with a group_id".format(
+                path=spec_file))
+            return result
+
+        context = ssl_context(verify_ssl, ca_file)
+        trigger_module = load_library_module('hawkular_alerts_group_trigger')
+        client_options = dict(rate_limiter=create_rate_limiter(max_rate and float(max_rate), rate_file, hostname, port))
+        connection = (tenant, hostname, int(port), scheme, token, context)
+
+        def audit(group):
+            try:
+                return group['group_id'], self.audit_group(group, connection, client_options)
+            except Exception as e:
+                return group['group_id'], dict(error=to_text(e))
+
+        pool = ThreadPool(max(1, min(workers, len(groups))))
+        try:
+            audits = pool.map(audit, groups)
+        finally:
+            pool.close()
+        differences = dict((group_id, group_differences) for group_id, group_differences in audits if group_differences)
+
+        group_trigger = trigger_module.HawkularAlertsGroupTrigger(PluginModule(), *connection, **client_options)
+        try:
+            live_groups = group_trigger.client.list_trigger_records('triggers')
+        except Exception as e:
+            result.update(failed=True, msg="Failed to list triggers. Error: {error}".format(error=to_text(e)))
+            return result
+        desired_group_ids = set(group['group_id'] for group in groups)
+        unmanaged_groups = sorted(trigger.id for trigger in live_groups
+                                  if trigger.type == 'GROUP' and trigger.id not in desired_group_ids)
+
+        drift = bool(differences or unmanaged_groups)
+        result.update(
+            changed=False,
+            drift=drift,
+            differences=differences,
+            unmanaged_groups=unmanaged_groups,
+            msg="Found drift in {count} of {total} groups".format(count=len(differences), total=len(groups))
+                if drift else "No drift found in {total} groups".format(total=len(groups)))
+        if any('error' in group_differences for group_differences in differences.values()):
+            result.update(failed=True, msg="Failed to audit some of the groups")
+        return result
@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+""" Compares the peak memory of listing group members through Trigger
+    objects and vars(), as the list states used to, with listing them
+    through TriggerRecords.
+
+    The synthetic group members response body is written to a temporary
+    file first. Each way then runs in its own interpreter, loading and
+    converting that body, and reports the growth of its peak RSS over the
+    interpreter with the modules and the client imported.
+
+    Usage:
+        python benchmarks/listing_memory.py [--python python2] [--members 10000]
+"""
+
+import os
+import sys
+import json
+import argparse
+import tempfile
+import subprocess
+
+PATH_HELPER = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'module_utils',
+                           'hawkular_alerts_path.py')
+
+LISTING = '''
+import imp, json, resource
+imp.load_source('hawkular_alerts_path', {path_helper!r})
+from ansible.module_utils import hawkular_alerts
+import hawkular.alerts
+before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+with open({body_path!r}) as f:
+    response = json.load(f)
+if {records}:
+    for i, trigger in enumerate(response):
+        response[i] = hawkular_alerts.TriggerRecord(trigger)
+    group_members = hawkular_alerts.to_dicts(response)
+else:
+    triggers = hawkular.alerts.Trigger.list_to_object_list(response)
+    group_members = [vars(trigger) for trigger in triggers]
+
+print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - before)
+'''
+
+
+def write_response_body(f, members):
+    """ Writes a synthetic group members response of members member
+        triggers to f
+    """
+    json.dump([{'id': 'member-%d' % i, 'name': 'Member %d' % i, 'type': 'MEMBER', 'memberOf': 'group',
+                'severity': 'HIGH', 'enabled': True, 'eventType': 'ALERT', 'firingMatch': 'ALL',
+                'autoResolveMatch': 'ALL', 'tags': {'nodename': 'node-%d' % i},
+                'context': {'member': 'member-%d' % i}, 'dataIdMap': {'cpu': 'cpu-member-%d' % i}}
+               for i in range(members)], f)
+
+
+def peak_rss_growth(python, body_path, records):
+    """ Returns:
+            the peak RSS growth, in KiB, of loading and converting the
+            response body at body_path
+    """
+    code = LISTING.format(path_helper=PATH_HELPER, body_path=body_path, records=records)
+    return int(subprocess.check_output([python, '-c', code]).split()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compares the peak memory of the group members listing")
+    parser.add_argument('--python', default=sys.executable, help="the interpreter the modules run with")
+    parser.add_argument('--members', type=int, default=10000, help="the number of listed group members")
+    args = parser.parse_args()
+
+    with tempfile.NamedTemporaryFile('w', suffix='.json') as body:
+        write_response_body(body, args.members)
+        body.flush()
+        objects = peak_rss_growth(args.python, body.name, False)
+        records = peak_rss_growth(args.python, body.name, True)
+    print("{0:<25} {1:>10} KiB".format('Trigger objects + vars()', objects))
+    print("{0:<25} {1:>10} KiB".format('TriggerRecords', records))
+    print("{0:<25} {1:>10.1f} %".format('reduction', 100.0 * (objects - records) / objects))
+
+
+if __name__ == '__main__':
+    main()
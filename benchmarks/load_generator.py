@@ -0,0 +1,195 @@
+#!/usr/bin/env python
+""" Generates load on a hawkular alerts server through the modules' classes,
+    before rolling out large group definitions.
+
+    Creates --groups group triggers with --conditions conditions each, adds
+    --members member triggers to each group trigger, optionally pushes
+    --data-points data points for each data id of each member, and reports
+    the throughput and the latency percentiles of each operation. Up to
+    --concurrency operations run at the same time, each one with its own
+    module object and client, as concurrent tasks would.
+
+    Runs against the endpoint passed with --url or, without it, against an
+    in-memory fake of the alerts API of the tests, started in the same
+    process, which only measures the client side of the modules.
+
+    The modules use urllib2, so this runs with the python 2 interpreter the
+    modules run with.
+
+    Usage:
+        python2 benchmarks/load_generator.py [--url https://hawkular.example.com:443] [--token TOKEN]
+            [--tenant load] [--groups 10] [--members 100] [--conditions 3] [--concurrency 20]
+            [--data-points 0] [--cleanup]
+"""
+
+import os
+import imp
+import sys
+import math
+import time
+import argparse
+from multiprocessing.pool import ThreadPool
+
+try:
+    from urlparse import urlparse
+except ImportError:
+    from urllib.parse import urlparse
+
+LIBRARY_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'library')
+PATH_HELPER = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'module_utils',
+                           'hawkular_alerts_path.py')
+
+# the fake alerts server is shared with the tests
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'tests'))
+from fake_alerts import start_fake_server
+
+
+class LoadFailure(Exception):
+    pass
+
+
+class LoadModule(object):
+    """ Stands in for the AnsibleModule of the module classes
+    """
+    def fail_json(self, msg, **kwargs):
+        raise LoadFailure(msg)
+
+    def log(self, msg):
+        pass
+
+
+class Operation(object):
+    """ Latencies and errors of one kind of operation
+    """
+    def __init__(self, name):
+        self.name = name
+        self.latencies = []
+        self.errors = []
+        self.elapsed = 0.0
+
+    def run(self, func, *args):
+        start = time.time()
+        try:
+            func(*args)
+        except Exception as e:
+            self.errors.append(e)
+        else:
+            self.latencies.append(time.time() - start)
+
+    def percentile(self, p):
+        """ Returns:
+                the nearest-rank p percentile of the latencies, in ms
+        """
+        latencies = sorted(self.latencies)
+        if not latencies:
+            return float('nan')
+        return 1000 * latencies[max(0, int(math.ceil(p / 100.0 * len(latencies))) - 1)]
+
+    def report(self):
+        count = len(self.latencies) + len(self.errors)
+        rate = count / self.elapsed if self.elapsed else float('nan')
+        print("{0:<16} {1:>8} {2:>7} {3:>10.1f} {4:>9.1f} {5:>9.1f} {6:>9.1f} {7:>9.1f}".format(
+            self.name, count, len(self.errors), rate, self.percentile(50), self.percentile(90),
+            self.percentile(99), self.percentile(100)))
+        if self.errors:
+            print("  first error: {0}".format(self.errors[0]))
+
+
+def run_operation(pool, name, func, items):
+    """ Runs func(item) for each of the items on the pool
+
+        Returns:
+            the Operation, with the latency of each call
+    """
+    operation = Operation(name)
+    start = time.time()
+    pool.map(lambda item: operation.run(func, item), items)
+    operation.elapsed = time.time() - start
+    return operation
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generates load on a hawkular alerts server through the modules")
+    parser.add_argument('--url', help="the hawkular endpoint, the in-memory fake server when omitted")
+    parser.add_argument('--token', default=os.environ.get('HAWKULAR_TOKEN'), help="the hawkular auth token")
+    parser.add_argument('--tenant', default='load', help="the tenant the load is created in")
+    parser.add_argument('--insecure', action='store_true', help="do not verify the endpoint SSL certificate")
+    parser.add_argument('--groups', type=int, default=10, help="the number of group triggers")
+    parser.add_argument('--members', type=int, default=100, help="the number of members of each group trigger")
+    parser.add_argument('--conditions', type=int, default=3, help="the number of conditions of each group trigger")
+    parser.add_argument('--concurrency', type=int, default=20, help="the number of operations run at the same time")
+    parser.add_argument('--data-points', type=int, default=0,
+                        help="the number of data points pushed for each data id of each member")
+    parser.add_argument('--prefix', default='load', help="the prefix of the generated ids")
+    parser.add_argument('--cleanup', action='store_true', help="delete the group triggers and members at the end")
+    args = parser.parse_args()
+
+    imp.load_source('hawkular_alerts_path', PATH_HELPER)
+    trigger_module = imp.load_source('hawkular_alerts_group_trigger',
+                                     os.path.join(LIBRARY_PATH, 'hawkular_alerts_group_trigger.py'))
+    member_module = imp.load_source('hawkular_alerts_group_member',
+                                    os.path.join(LIBRARY_PATH, 'hawkular_alerts_group_member.py'))
+
+    if args.url is None:
+        server = start_fake_server()
+        args.url = 'http://127.0.0.1:{0}'.format(server.server_address[1])
+    url = urlparse(args.url)
+    context = None
+    if args.insecure:
+        import ssl
+        context = ssl._create_unverified_context()
+    connection = (args.tenant, url.hostname, url.port or (443 if url.scheme == 'https' else 80), url.scheme,
+                  args.token, context)
+
+    data_ids = ['{0}-data-{1}'.format(args.prefix, k) for k in range(args.conditions)]
+    conditions = [dict(name='condition {0}'.format(k), trigger_mode='FIRING', type='THRESHOLD',
+                       data_id=data_id, operator='GT', threshold=90.0) for k, data_id in enumerate(data_ids)]
+    group_ids = ['{0}-group-{1}'.format(args.prefix, g) for g in range(args.groups)]
+    members = [(group_id, '{0}-member-{1}'.format(group_id, m)) for group_id in group_ids for m in range(args.members)]
+
+    def create_group(group_id):
+        group_trigger = trigger_module.HawkularAlertsGroupTrigger(LoadModule(), *connection)
+        group_trigger.create_or_update_group_trigger('Load ' + group_id, group_id, 'load test', 'LOW', False,
+                                                     {'load': args.prefix}, True, conditions)
+
+    def create_member(member):
+        group_id, member_id = member
+        group_member = member_module.HawkularAlertsGroupMember(LoadModule(), *connection)
+        data_id_map = dict((data_id, '{0}-{1}'.format(data_id, member_id)) for data_id in data_ids)
+        group_member.create_group_member(group_id, member_id, data_id_map, {'member': member_id}, member_id)
+
+    def push_data(member):
+        group_id, member_id = member
+        client = member_module.HawkularAlertsGroupMember(LoadModule(), *connection).client
+        now = int(time.time() * 1000)
+        points = [dict(id='{0}-{1}'.format(data_id, member_id), timestamp=now - i, value=float(i % 100))
+                  for data_id in data_ids for i in range(args.data_points)]
+        client._post(client._service_url('data'), points, parse_json=False)
+
+    def delete_group(group_id):
+        group_trigger = trigger_module.HawkularAlertsGroupTrigger(LoadModule(), *connection)
+        group_trigger.delete_group_trigger(group_id)
+
+    print("{0} group triggers x {1} members x {2} conditions on {3}, concurrency {4}".format(
+        args.groups, args.members, args.conditions, args.url, args.concurrency))
+    pool = ThreadPool(args.concurrency)
+    try:
+        operations = [run_operation(pool, 'create group', create_group, group_ids),
+                      run_operation(pool, 'create member', create_member, members)]
+        if args.data_points:
+            operations.append(run_operation(pool, 'push data', push_data, members))
+        if args.cleanup:
+            operations.append(run_operation(pool, 'delete group', delete_group, group_ids))
+    finally:
+        pool.close()
+
+    print("{0:<16} {1:>8} {2:>7} {3:>10} {4:>9} {5:>9} {6:>9} {7:>9}".format(
+        'operation', 'count', 'errors', 'ops/s', 'p50 ms', 'p90 ms', 'p99 ms', 'max ms'))
+    for operation in operations:
+        operation.report()
+    if any(operation.errors for operation in operations):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+""" Measures the cold start time of each of the modules in the library
+    directory against a budget.
+
+    The cold start time of a module is the time a fresh interpreter takes to
+    import it, which is what every task pays before the module decides what
+    to do, minus the time the same interpreter takes to start up empty.
+
+    Usage:
+        python benchmarks/module_startup.py [--python python2] [--runs 10] [--budget-ms 200]
+
+    Exits with a non-zero status if the median cold start time of any module
+    is over the budget.
+"""
+
+import os
+import sys
+import time
+import argparse
+import subprocess
+
+LIBRARY_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'library')
+PATH_HELPER = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'module_utils',
+                           'hawkular_alerts_path.py')
+MODULES = ['hawkular_alerts_group_trigger', 'hawkular_alerts_group_member', 'hawkular_alerts_group_dampening']
+
+IMPORT_MODULE = ("import imp; imp.load_source('hawkular_alerts_path', '{path_helper}'); "
+                 "imp.load_source('{name}', '{path}')")
+
+
+def median_run_time(python, code, runs):
+    """ Returns:
+            the median wall time, in milliseconds, of running code in a fresh interpreter
+    """
+    times = []
+    for _ in range(runs):
+        start = time.time()
+        subprocess.check_call([python, '-c', code])
+        times.append((time.time() - start) * 1000)
+    times.sort()
+    return times[len(times) // 2]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measures the cold start time of the modules against a budget")
+    parser.add_argument('--python', default=sys.executable, help="the interpreter the modules run with")
+    parser.add_argument('--runs', type=int, default=10, help="the number of runs per module")
+    parser.add_argument('--budget-ms', type=float, default=200, help="the cold start budget per module")
+    args = parser.parse_args()
+
+    baseline = median_run_time(args.python, 'pass', args.runs)
+    print("{0:<35} {1:>8.1f} ms".format('interpreter', baseline))
+    over_budget = []
+    for name in MODULES:
+        code = IMPORT_MODULE.format(path_helper=PATH_HELPER, name=name, path=os.path.join(LIBRARY_PATH, name + '.py'))
+        startup = median_run_time(args.python, code, args.runs) - baseline
+        print("{0:<35} {1:>8.1f} ms".format(name, startup))
+        if startup > args.budget_ms:
+            over_budget.append(name)
+
+    if over_budget:
+        print("over the {budget} ms budget: {modules}".format(budget=args.budget_ms, modules=', '.join(over_budget)))
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
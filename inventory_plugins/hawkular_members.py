@@ -0,0 +1,134 @@
+# Dynamic inventory of Hawkular Alerts group members, backed by the inventory cache
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+DOCUMENTATION = '''
+    name: hawkular_members
+    plugin_type: inventory
+    short_description: Hawkular Alerts group member triggers as inventory hosts
+    description:
+        - Adds an inventory group per group trigger, with a host per member trigger of that group.
+        - The member trigger definition is set as the C(hawkular_trigger) host variable.
+        - Members are listed by the hawkular_alerts_group_member module's class.
+        - Uses a YAML configuration file that ends with hawkular_members.(yml|yaml).
+        - Enable the inventory cache to avoid listing the members again on every run.
+    requirements: [ hawkular/hawkular-client-python ]
+    author: Daniel Korn (@dkorn)
+    extends_documentation_fragment:
+        - inventory_cache
+    options:
+        plugin:
+            description: marks this as an instance of the 'hawkular_members' plugin
+            required: true
+            choices: ['hawkular_members']
+        hawkular_api_hostname:
+            description: the hawkular API hostname
+            required: true
+            env:
+                - name: HAWKULAR_HOSTNAME
+        hawkular_api_port:
+            description: the hawkular API port
+            required: true
+            type: int
+            env:
+                - name: HAWKULAR_PORT
+        hawkular_api_auth_token:
+            description: the hawkular API auth token
+            required: true
+            env:
+                - name: HAWKULAR_TOKEN
+        tenant:
+            description: the hawkular tenant
+            required: true
+        group_ids:
+            description: the group trigger ids whose members should be added
+            required: true
+            type: list
+        scheme:
+            description: the hawkular scheme
+            default: 'https'
+            choices: ['https', 'http']
+        verify_ssl:
+            description: whether SSL certificates should be verified for HTTPS requests
+            type: bool
+            default: True
+        ca_file_path:
+            description: the path to a ca file
+            default: null
+'''
+
+EXAMPLES = '''
+# hawkular.hawkular_members.yml, requires `enable_plugins = hawkular_members` in the [inventory] section
+plugin: hawkular_members
+tenant: '_system'
+group_ids:
+  - test_group-01
+cache: yes
+cache_plugin: jsonfile
+cache_connection: /tmp/hawkular_inventory
+cache_timeout: 600
+'''
+
+import os
+import imp
+
+from ansible.plugins.inventory import BaseInventoryPlugin, Cacheable, to_safe_group_name
+
+imp.load_source('hawkular_alerts_path', os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                                    'module_utils', 'hawkular_alerts_path.py'))
+
+from ansible.module_utils.hawkular_alerts import PluginModule, load_library_module, ssl_context
+
+
+class InventoryModule(BaseInventoryPlugin, Cacheable):
+
+    NAME = 'hawkular_members'
+
+    def verify_file(self, path):
+        if super(InventoryModule, self).verify_file(path):
+            return path.endswith(('hawkular_members.yml', 'hawkular_members.yaml'))
+        return False
+
+    def list_group_members(self):
+        """
+            Returns:
+                Hash (dictionary) of the member triggers of each configured group, by group id
+        """
+        context = ssl_context(self.get_option('verify_ssl'), self.get_option('ca_file_path'))
+
+        group_member_class = load_library_module('hawkular_alerts_group_member').HawkularAlertsGroupMember
+        hawkular_alerts = group_member_class(PluginModule(),
+                                             self.get_option('tenant'),
+                                             self.get_option('hawkular_api_hostname'),
+                                             self.get_option('hawkular_api_port'),
+                                             self.get_option('scheme'),
+                                             self.get_option('hawkular_api_auth_token'),
+                                             context)
+        return dict((group_id, hawkular_alerts.list_group_members(group_id)['group_members'])
+                    for group_id in self.get_option('group_ids'))
+
+    def parse(self, inventory, loader, path, cache=True):
+        super(InventoryModule, self).parse(inventory, loader, path)
+        self._read_config_data(path)
+
+        cache_key = self.get_cache_key(path)
+        # false when refresh_cache or --flush-cache is used
+        use_cache = cache and self.get_option('cache')
+        update_cache = False
+        members_by_group = None
+        if use_cache:
+            try:
+                members_by_group = self._cache[cache_key]
+            except KeyError:
+                update_cache = True
+        if members_by_group is None:
+            members_by_group = self.list_group_members()
+        if update_cache or (not cache and self.get_option('cache')):
+            self._cache[cache_key] = members_by_group
+
+        for group_id, members in members_by_group.items():
+            group = self.inventory.add_group(to_safe_group_name(group_id))
+            for member in members:
+                self.inventory.add_host(member['id'], group=group)
+                self.inventory.set_variable(member['id'], 'hawkular_trigger', member)
@@ -0,0 +1,125 @@
+#!/usr/bin/python
+# The audit runs on the controller, see action_plugins/hawkular_alerts_audit.py
+
+
+DOCUMENTATION = '''
+---
+module: hawkular_alerts_audit
+description: The hawkular_alerts_audit module reports the drift of a Hawkular Alerts tenant from a desired-state spec file, without changing anything
+short_description: Reporting Group Trigger, Condition, Dampening and Member drift in Hawkular Alerting
+requirements: [ hawkular/hawkular-client-python ]
+author: Daniel Korn (@dkorn)
+notes:
+  - Runs on the controller, as an action plugin
+  - Each group is compared using the same checks as the hawkular_alerts_group_trigger,
+    hawkular_alerts_group_dampening and hawkular_alerts_group_member modules,
+    and groups are read concurrently
+options:
+  hawkular_api_hostname:
+    description:
+      - the hawkular API hostname
+    default: HAWKULAR_HOSTNAME env var if set, otherwise it is required to pass it
+    required: True
+  hawkular_api_port:
+    description:
+      - the hawkular API port
+    default: HAWKULAR_PORT env var if set, otherwise it is required to pass it
+    required: True
+  hawkular_api_auth_token:
+    description:
+      - the hawkular API auth token
+    default: HAWKULAR_TOKEN env var if set, otherwise it is required to pass it
+    required: True
+  tenant:
+    description:
+      - the hawkular tenant
+    required: True
+  spec_file:
+    description:
+      - path to a YAML or JSON file describing the desired groups
+      - The file holds a groups list, each group with the group_id, name,
+        event_text, severity, auto_resolve, tags, enabled and conditions
+        options of hawkular_alerts_group_trigger, the dampenings option of
+        hawkular_alerts_group_dampening, and a members list with the id
+        of each group member
+      - The task fails without auditing when the file doesn't hold a
+        mapping with a groups list, or a group has no group_id
+    required: True
+  concurrency:
+    description:
+      - the maximum number of groups read at the same time
+    required: False
+    default: 10
+  scheme:
+    description:
+      - the hawkular scheme
+    default: 'https'
+    required: False
+    choices: ['https', 'http']
+  verify_ssl:
+    description:
+      - whether SSL certificates should be verified for HTTPS requests
+    required: false
+    default: True
+    choices: ['True', 'False']
+  ca_file_path:
+    description:
+      - the path to a ca file
+    required: false
+    default: null
+  max_requests_per_second:
+    description:
+      - the maximum rate of requests sent to the hawkular API, shared with
+        the modules through rate_limit_file
+    required: false
+    default: null
+  rate_limit_file:
+    description:
+      - the state file of the request rate limit
+    required: false
+    default: a file per user, API hostname and port in the system temp directory
+'''
+
+EXAMPLES = '''
+# Audit a tenant against its desired state
+  hawkular_alerts_audit:
+    hawkular_api_hostname: 'hawkular-endpoint.example.com'
+    hawkular_api_port: 443
+    hawkular_api_auth_token: '******'
+    tenant: '_system'
+    spec_file: tenant_spec.yml
+
+# tenant_spec.yml
+groups:
+  - group_id: 'example-group-trigger'
+    name: 'Example Group Trigger'
+    severity: 'HIGH'
+    conditions:
+      - name: 'Example Condition 01'
+        trigger_mode: 'FIRING'
+        type: 'THRESHOLD'
+        data_id: 'example_condition'
+        operator: 'GT'
+        threshold: 0.8
+    dampenings:
+      FIRING:
+        type: 'STRICT'
+        eval_true_setting: 3
+    members:
+      - id: 'member1'
+'''
+
+RETURN = '''
+drift:
+  description: whether any difference was found
+  type: bool
+differences:
+  description:
+    - the differences of each drifted group, by group id, with the keys
+      missing, trigger_updates, conditions, dampenings, missing_members,
+      unmanaged_members and error
+  type: dict
+unmanaged_groups:
+  description: ids of group triggers in the tenant that are not in the spec file
+  type: list
+'''
@@ -27,7 +27,20 @@ options:
   tenant:
     description:
       - the hawkular tenant
-    required: True
+      - Either tenant or tenants is required
+    required: False
+  tenants:
+    description:
+      - a list of hawkular tenants to apply the same state to
+      - The tenants are handled concurrently, each with its own client, and
+        the result of each tenant is returned under results, by tenant
+    required: False
+    default: null
+  tenant_concurrency:
+    description:
+      - the maximum number of tenants handled at the same time, at least 1
+    required: False
+    default: 10
   group_id:
     description:
       - the owning group trigger id
@@ -60,6 +73,20 @@ options:
         'FIRING' or 'AUTORESOLVE'
     required: False
     default: null
+  force_compare:
+    description:
+      - On present, the fingerprint of the applied dampenings is kept in the
+        group trigger context, and a group trigger holding the fingerprint of
+        the same desired dampenings is left as is after a single request
+      - Set to compare the group trigger dampenings anyway, such as after
+        they were changed outside of Ansible
+      - A group trigger whose dampenings were applied before the
+        fingerprints gets the fingerprint on the first run, even when the
+        dampenings are unchanged. That group trigger update is cascaded by
+        the server to every member trigger, so it is reported as a change,
+        along with fingerprint_stored
+    required: false
+    default: false
   verify_ssl:
     description:
       - whether SSL certificates should be verified for HTTPS requests
@@ -71,6 +98,42 @@ options:
       - the path to a ca file
     required: false
     default: null
+  max_requests_per_second:
+    description:
+      - the maximum rate of requests sent to the hawkular API
+      - The limit is a token bucket shared through rate_limit_file by every
+        module process and tenant on the host running the module, so it
+        holds when raising forks
+    required: false
+    default: null
+  rate_limit_file:
+    description:
+      - the state file of the request rate limit, every module process
+        using the same file shares the same limit
+    required: false
+    default: a file per user, API hostname and port in the system temp directory
+  accept_gzip:
+    description:
+      - whether to ask the hawkular API for gzip compressed responses, which
+        are decompressed as they are read
+    required: false
+    default: True
+  gzip_request_min_size:
+    description:
+      - gzip compress request bodies of at least this many bytes, such as
+        large condition and member payloads
+      - The hawkular server must be configured to accept gzip encoded
+        requests, request bodies are not compressed by default
+    required: false
+    default: null
+  profile_output:
+    description:
+      - write a cProfile profile of the module run to this path on the
+        host running the module, which can be read with python -m pstats
+      - The profile covers the hawkular client import, SSL setup, requests
+        and comparisons, and with tenants the reconcile of every tenant
+    required: false
+    default: null
 '''
 
 EXAMPLES = '''
@@ -96,29 +159,75 @@ EXAMPLES = '''
 '''
 
 import os
-import ssl
-import urllib2
-import hawkular.alerts
+
+FINGERPRINT_KEY = 'ansible.dampenings.fingerprint'
 
 
 class HawkularAlertsGroupDampening(object):
     """ Hawkular Alerts object to create, update and delete group trigger dampenings in Hawkular
     """
-    def __init__(self, module, tenant, hostname, port, scheme, token, context):
+    def __init__(self, module, tenant, hostname, port, scheme, token, context, **client_options):
         self.module  = module
-        self.client  = hawkular.alerts.HawkularAlertsClient(tenant, host=hostname, port=port, scheme=scheme, token=token, context=context)
         self.changed = False
+        self._tenant = tenant
+        self._client = None
+        self._client_options = dict(client_options, host=hostname, port=port, scheme=scheme, token=token,
+                                    context=context)
 
-    def group_trigger_exist(self, group_id):
+    @property
+    def client(self):
+        """ The hawkular alerts client, created on first use
+        """
+        if self._client is None:
+            self._client = create_client(self._tenant, **self._client_options)
+        return self._client
+
+    @property
+    def api_calls(self):
+        """ The number of requests sent to the hawkular API so far
+        """
+        return self._client.api_calls if self._client is not None else 0
+
+    def get_group_trigger(self, group_id):
         """
             Returns:
-                True if a group trigger with the passed id exists, False otherwise
+                the group trigger with the passed id, None if it doesn't exist
         """
+        import urllib2
         try:
-            self.client.get_trigger(group_id)
+            return self.client.get_trigger(group_id)
         except urllib2.HTTPError as e:
             if e.code == 404:
-                return False
+                return None
+            raise
+
+    def group_trigger_exist(self, group_id):
+        """
+            Returns:
+                True if a group trigger with the passed id exists, False otherwise
+        """
+        return self.get_group_trigger(group_id) is not None
+
+    def store_fingerprint(self, trigger, fingerprint):
+        """ Stores the fingerprint of the applied dampenings in the group
+            trigger context, or removes it when fingerprint is None, unless
+            the context already holds it
+
+            Returns:
+                True if the context was updated, False otherwise
+        """
+        context = dict(trigger.context or {})
+        if context.get(FINGERPRINT_KEY) == fingerprint:
+            return False
+        if fingerprint is None:
+            del context[FINGERPRINT_KEY]
+        else:
+            context[FINGERPRINT_KEY] = fingerprint
+        trigger.context = context
+        try:
+            self.client.update_group_trigger(trigger.id, trigger)
+        except Exception as e:
+            self.module.fail_json(msg="Failed to store group dampenings fingerprint. Error: {error}".format(error=e))
         return True
 
     def get_group_dampenings(self, group_id):
@@ -141,7 +250,8 @@ class HawkularAlertsGroupDampening(object):
                 whether or not a change took place and a short message
                 describing the operation executed
         """
-        if not self.group_trigger_exist(group_id):
+        group_trigger = self.get_group_trigger(group_id)
+        if group_trigger is None:
             self.module.fail_json(msg="Group trigger {group_id} doesn't exist".format(group_id=group_id))
         current_dampenings_by_trigger_mode = self.get_group_dampenings(group_id)
         messages = []
@@ -156,6 +266,8 @@ class HawkularAlertsGroupDampening(object):
                     self.module.fail_json(msg="Failed to delete group dampening. Error: {error}".format(error=e))
             else:
                 messages.append("Group dampening with trigger mode {trigger_mode} doesn't exist".format(trigger_mode=d))
+        if self.store_fingerprint(group_trigger, None):
+            self.changed = True
         return dict(
             msg=messages,
             changed=self.changed)
@@ -193,6 +305,7 @@ class HawkularAlertsGroupDampening(object):
                 whether or not a change took place and a short message
                 describing the operation executed
         """
+        import hawkular.alerts
         dampening_object = hawkular.alerts.Dampening(dampening)
         try:
             self.client.update_group_dampening(group_id, dampening_id, dampening_object)
@@ -207,6 +320,7 @@ class HawkularAlertsGroupDampening(object):
                 whether or not a change took place and a short message
                 describing the operation executed
         """
+        import hawkular.alerts
         new_dampening = hawkular.alerts.Dampening(dampening)
         try:
             self.client.create_group_dampening(group_id, new_dampening)
@@ -214,15 +328,23 @@ class HawkularAlertsGroupDampening(object):
             self.module.fail_json(msg="Failed to create dampening. Error: {error}".format(error=e))
         self.changed = True
 
-    def create_or_update_group_dampenings(self, group_id, dampenings):
+    def create_or_update_group_dampenings(self, group_id, dampenings, force_compare=False):
         """ Creates or updates group trigger dampening in Hawkular Alerts
 
+            Unless force_compare is set, a group trigger whose context holds
+            the fingerprint of the same desired dampenings is left as is,
+            without listing and comparing its dampenings
+
             Returns:
                 whether or not a change took place and a short message
                 describing the operation executed
         """
-        if not self.group_trigger_exist(group_id):
-            self.module.fail(msg="Group trigger (group_id} does not exist ".format(group_id=group_id))
+        group_trigger = self.get_group_trigger(group_id)
+        if group_trigger is None:
+            self.module.fail_json(msg="Group trigger {group_id} does not exist ".format(group_id=group_id))
+        fingerprint = spec_fingerprint(dampenings)
+        if not force_compare and (group_trigger.context or {}).get(FINGERPRINT_KEY) == fingerprint:
+            return dict(msg=["dampenings match the last applied spec, nothing to change"], changed=self.changed)
         messages = []
         current_dampenings_by_trigger_mode = self.get_group_dampenings(group_id)
         for trigger_mode, desired_dampening in dampenings.items():
@@ -239,7 +361,11 @@ class HawkularAlertsGroupDampening(object):
                 messages.append("Successfully created {trigger_mode} dampening: {dampening}".format(trigger_mode=trigger_mode, dampening=desired_dampening_copy))
         if not messages:
             messages.append("dampening already exist, nothing to change")
-        return dict(msg=messages, changed=self.changed)
+        # on unchanged dampenings applied before the fingerprints, the update is cascaded to the members
+        stored = self.store_fingerprint(group_trigger, fingerprint)
+        if stored:
+            self.changed = True
+        return dict(msg=messages, changed=self.changed, fingerprint_stored=stored)
 
 
 def main():
@@ -251,14 +377,24 @@ def main():
                 default=os.environ.get('HAWKULAR_PORT'), type='int'),
             hawkular_api_auth_token=dict(
                 default=os.environ.get('HAWKULAR_TOKEN'), type='str', no_log=True),
-            tenant=dict(required=True, type='str'),
+            tenant=dict(required=False, type='str'),
+            tenants=dict(required=False, type='list'),
+            tenant_concurrency=dict(required=False, type='int', default=10),
             group_id=dict(required=True, type='str'),
             state=dict(required=True, type='str', choices=['present', 'absent', 'list']),
             scheme=dict(required=False, type='str', choices=['https', 'http'], default='https'),
             dampenings=dict(required=False, type='dict'),
             ca_file_path=dict(required=False, type='str'),
             verify_ssl=dict(required=False, type='bool', default=True),
+            max_requests_per_second=dict(required=False, type='float'),
+            rate_limit_file=dict(required=False, type='path'),
+            accept_gzip=dict(required=False, type='bool', default=True),
+            gzip_request_min_size=dict(required=False, type='int'),
+            profile_output=dict(required=False, type='path'),
+            force_compare=dict(required=False, type='bool', default=False),
         ),
+        required_one_of=[['tenant', 'tenants']],
+        mutually_exclusive=[['tenant', 'tenants']],
         required_if=[
             ('state', 'present', ['dampenings']),
             ('state', 'absent', ['dampenings'])
@@ -271,35 +407,66 @@ def main():
     if len(module.params["dampenings"]) > 2:
         module.fail_json(msg="A group trigger can have 2 dampenings at most")
 
+    for arg in ['tenant_concurrency']:
+        if module.params[arg] < 1:
+            module.fail_json(msg="{arg} must be at least 1, got: {value}".format(arg=arg, value=module.params[arg]))
+
     hostname   = module.params['hawkular_api_hostname']
     port       = module.params['hawkular_api_port']
     token      = module.params['hawkular_api_auth_token']
     tenant     = module.params['tenant']
+    tenants    = module.params['tenants']
+    workers    = module.params['tenant_concurrency']
     group_id   = module.params['group_id']
     scheme     = module.params['scheme']
     state      = module.params['state']
     dampenings = module.params['dampenings']
     verify_ssl = module.params['verify_ssl']
     ca_file    = module.params['ca_file_path']
+    max_rate   = module.params['max_requests_per_second']
+    rate_file  = module.params['rate_limit_file']
+    compressed = module.params['accept_gzip']
+    gzip_min   = module.params['gzip_request_min_size']
+    profile    = module.params['profile_output']
+    force      = module.params['force_compare']
 
-    context = None
-    if not verify_ssl:
-        context = ssl._create_unverified_context()
-    elif ca_file:
-        context = ssl.create_default_context(cafile=ca_file)
+    profiler = None
+    if profile:
+        profiler = RunProfiler(profile)
+        profiler.start()
 
-    hawkular_alerts = HawkularAlertsGroupDampening(module, tenant, hostname, port, scheme, token, context)
+    context = ssl_context(verify_ssl, ca_file)
+    rate_limiter = create_rate_limiter(max_rate, rate_file, hostname, port)
+    client_options = dict(rate_limiter=rate_limiter, accept_gzip=compressed, gzip_request_min_size=gzip_min)
 
-    if state == "present":
-        res_args = hawkular_alerts.create_or_update_group_dampenings(group_id, dampenings)
-    elif state == "list":
-        res_args = hawkular_alerts.list_group_dampenings(group_id)
-    elif state == "absent":
-        res_args = hawkular_alerts.delete_group_dampenings(group_id, dampenings)
+    def reconcile(tenant_module, tenant):
+        hawkular_alerts = HawkularAlertsGroupDampening(tenant_module, tenant, hostname, port, scheme, token, context, **client_options)
+
+        if state == "present":
+            res_args = hawkular_alerts.create_or_update_group_dampenings(group_id, dampenings, force)
+        elif state == "list":
+            res_args = hawkular_alerts.list_group_dampenings(group_id)
+        elif state == "absent":
+            res_args = hawkular_alerts.delete_group_dampenings(group_id, dampenings)
+        res_args['api_calls'] = hawkular_alerts.api_calls
+        return res_args
+
+    if tenants:
+        if profiler is not None:
+            reconcile = profiler.wrap(reconcile)
+        res_args = reconcile_tenants(module, tenants, reconcile, workers)
+    else:
+        try:
+            res_args = reconcile(module, tenant)
+        except RateLimitError as e:
+            module.fail_json(msg=str(e))
     module.exit_json(**res_args)
 
 
 # Import module bits
-from ansible.module_utils.basic import *
+from ansible.module_utils.basic import AnsibleModule
+from ansible.module_utils.hawkular_alerts import (RateLimitError, RunProfiler, create_client,
+                                                  create_rate_limiter, reconcile_tenants, spec_fingerprint,
+                                                  ssl_context)
 if __name__ == "__main__":
     main()
@@ -27,33 +27,76 @@ options:
   tenant:
     description:
       - the hawkular tenant
-    required: True
+      - Either tenant or tenants is required
+    required: False
+  tenants:
+    description:
+      - a list of hawkular tenants to apply the same state to
+      - The tenants are handled concurrently, each with its own client, and
+        the result of each tenant is returned under results, by tenant
+    required: False
+    default: null
+  tenant_concurrency:
+    description:
+      - the maximum number of tenants handled at the same time, at least 1
+    required: False
+    default: 10
   group_id:
     description:
       - the group trigger id
     required: True
   id:
     description:
-      - the group member id
+      - the group member id, required on absent
     default: null
     required: False
   data_id_map:
     description:
       - a mapping of the token to the real data_id
-    required: True
+      - On present, either id and data_id_map, or member_ids and
+        data_id_map_template are required
+    required: False
+  member_ids:
+    description:
+      - On present, the ids of group members to create, in place of id.
+        Their data_id_map is expanded from data_id_map_template by the
+        module, and the missing members are created concurrently
+      - The ids are converted to strings, as the trigger ids of the server,
+        and repeated ids are created once
+      - Unlike the group trigger and its dampenings, the member set is not
+        fingerprinted. Storing a fingerprint would update the group trigger,
+        which the server cascades to every member trigger. Each run lists
+        the existing members once instead
+    default: null
+    required: False
+  data_id_map_template:
+    description:
+      - the template of the member data_id of each data_id of the group
+        trigger conditions, such as '{data_id}-{member_id}', expanded into
+        the data_id_map of each of the member_ids
+    default: null
+    required: False
+  member_concurrency:
+    description:
+      - the maximum number of member_ids created at the same time, at least 1
+    default: 10
+    required: False
   tags:
     description:
       - Tags defined by the user for this trigger. A tag is a [name, value] pair
+      - With member_ids, the values may reference the '{member_id}'
     default: null
     required: False
   name:
     description:
       - the group member name
+      - With member_ids, the name may reference the '{member_id}'
     default: null
     required: False
   description:
     description:
       - the group member description
+      - With member_ids, the description may reference the '{member_id}'
     default: null
     required: False
   state:
@@ -83,6 +126,51 @@ options:
       - the path to a ca file
     required: false
     default: null
+  output_path:
+    description:
+      - On list, write the group members to this file as JSON lines, one
+        member trigger per line, instead of returning them in the module result
+      - The members listing of the API is not paged, so the members are
+        written once the whole listing arrived
+      - Only the number of listed members and the path are returned
+    required: false
+    default: null
+  max_requests_per_second:
+    description:
+      - the maximum rate of requests sent to the hawkular API
+      - The limit is a token bucket shared through rate_limit_file by every
+        module process and tenant on the host running the module, so it
+        holds when raising forks
+    required: false
+    default: null
+  rate_limit_file:
+    description:
+      - the state file of the request rate limit, every module process
+        using the same file shares the same limit
+    required: false
+    default: a file per user, API hostname and port in the system temp directory
+  accept_gzip:
+    description:
+      - whether to ask the hawkular API for gzip compressed responses, which
+        are decompressed as they are read
+    required: false
+    default: True
+  gzip_request_min_size:
+    description:
+      - gzip compress request bodies of at least this many bytes, such as
+        large condition and member payloads
+      - The hawkular server must be configured to accept gzip encoded
+        requests, request bodies are not compressed by default
+    required: false
+    default: null
+  profile_output:
+    description:
+      - write a cProfile profile of the module run to this path on the
+        host running the module, which can be read with python -m pstats
+      - The profile covers the hawkular client import, SSL setup, requests
+        and comparisons, and with tenants the reconcile of every tenant
+    required: false
+    default: null
 '''
 
 EXAMPLES = '''
@@ -103,43 +191,93 @@ EXAMPLES = '''
       nodename: mynode.example.com
     verify_ssl: True
     ca_file_path: /path/to/cafile.pem
+
+# create the members of a group from a template
+  hawkular_alerts_member:
+    hawkular_api_hostname: 'hawkular-endpoint.example.com'
+    port: 443
+    token: '******'
+    tenant: '_system'
+    state: 'present'
+    group_id: 'example-group-trigger'
+    member_ids: "{{ groups['nodes'] }}"
+    data_id_map_template: '{data_id}-{member_id}'
+    name: 'Member {member_id}'
+    tags:
+      nodename: '{member_id}'
+
+# list the members of a large group into a file
+  hawkular_alerts_member:
+    hawkular_api_hostname: 'hawkular-endpoint.example.com'
+    port: 443
+    token: '******'
+    tenant: '_system'
+    state: 'list'
+    group_id: 'example-group-trigger'
+    output_path: /tmp/example-group-trigger-members.jsonl
 '''
 
 import os
-import ssl
-import urllib2
-import hawkular.alerts
 
 
 class HawkularAlertsGroupMember(object):
     """ Hawkular Alerts object to create group members in Hawkular
     """
-    def __init__(self, module, tenant, hostname, port, scheme, token, context):
+    def __init__(self, module, tenant, hostname, port, scheme, token, context, **client_options):
         self.module  = module
-        self.client  = hawkular.alerts.HawkularAlertsClient(tenant, host=hostname, port=port, scheme=scheme, token=token, context=context)
         self.changed = False
+        self._tenant = tenant
+        self._client = None
+        self._client_options = dict(client_options, host=hostname, port=port, scheme=scheme, token=token,
+                                    context=context)
 
-    def list_group_members(self, group_id):
+    @property
+    def client(self):
+        """ The hawkular alerts client, created on first use
+        """
+        if self._client is None:
+            self._client = create_client(self._tenant, **self._client_options)
+        return self._client
+
+    @property
+    def api_calls(self):
+        """ The number of requests sent to the hawkular API so far
+        """
+        return self._client.api_calls if self._client is not None else 0
+
+    def list_group_members(self, group_id, output_path=None):
         """  Returns:
-                 all group member triggers
+                 all group member triggers, or when output_path is passed, the
+                 number of member triggers written to it as JSON lines
         """
         if not self.group_trigger_exist(group_id):
             self.module.fail_json(msg="Failed to list group members of group {group_id}".format(group_id=group_id))
         try:
-            group_members = self.client.get_group_members(group_id)
-            group_members_dicts_list = [vars(member) for member in group_members]
+            group_members = self.client.list_trigger_records(['triggers', 'groups', group_id, 'members'])
         except Exception as e:
             self.module.fail_json(msg="Failed to get group member triggers. Error: {error}".format(error=e))
+        if output_path is not None:
+            try:
+                count = write_json_lines(output_path, group_members)
+            except (IOError, OSError) as e:
+                self.module.fail_json(msg="Failed to write group members to {path}. Error: {error}".format(path=output_path, error=e))
+            return dict(
+                msg="Successfuly listed {count} group {group_id} member triggers to {path}".format(
+                    count=count, group_id=group_id, path=output_path),
+                changed=self.changed,
+                count=count,
+                output_path=output_path)
         return dict(
             msg="Successfuly listed group {group_id} member triggers".format(group_id=group_id),
             changed=self.changed,
-            group_members=group_members_dicts_list)
+            group_members=to_dicts(group_members))
 
     def group_trigger_exist(self, group_id):
         """
             Returns:
                 True if a group trigger with the passed id exist, False otherwise
         """
+        import urllib2
         try:
             self.client.get_trigger(group_id)
             return True
@@ -151,16 +289,22 @@ class HawkularAlertsGroupMember(object):
 
     def group_member_exist(self, group_id, id):
         """
-        Searches the member ID in the group trigger's members
+        Gets the member trigger by its ID, instead of listing all of the group
+        trigger's members
 
         Returns:
             True if the member already exist, False otherwise
         """
+        import urllib2
         try:
-            group_members = self.client.get_group_members(group_id)
+            member = self.client.get_trigger(id)
+        except urllib2.HTTPError as err:
+            if err.code == 404:
+                return False
+            self.module.fail_json(msg="Failed to get group member. Error: {error}".format(error=err))
         except Exception as e:
-            self.module.fail_json(msg="Failed to get group members. Error: {error}".format(error=e))
-        return any(gm.id == id for gm in group_members)
+            self.module.fail_json(msg="Failed to get group member. Error: {error}".format(error=e))
+        return member.member_of == group_id
 
     def delete_group_member(self, group_id, id):
         """ Deletes an existing group member trigger
@@ -187,13 +331,14 @@ class HawkularAlertsGroupMember(object):
                 whether or not a change took place and a short message
                 describing the operation executed
         """
-        if not self.group_trigger_exist(group_id):
-            self.module.fail_json(msg="Failed to create group member, group {group_id} does not exist ".format(group_id=group_id))
+        import hawkular.alerts
         if self.group_member_exist(group_id, id):
             return dict(
                 msg="Group member {name} already exist in group {group_id}".format(
                     name=name, group_id=group_id),
                 changed=self.changed)
+        if not self.group_trigger_exist(group_id):
+            self.module.fail_json(msg="Failed to create group member, group {group_id} does not exist ".format(group_id=group_id))
         try:
             #  create group member object
             member = hawkular.alerts.GroupMemberInfo()
@@ -211,6 +356,93 @@ class HawkularAlertsGroupMember(object):
         except Exception as e:
             self.module.fail_json(msg="Failed to create group member. Error: {error}".format(error=e))
 
+    def group_data_ids(self, group_id):
+        """
+            Returns:
+                the sorted data_ids of the group trigger conditions
+        """
+        try:
+            conditions = self.client.get_trigger_conditions(group_id)
+        except Exception as e:
+            self.module.fail_json(msg="Failed to get group trigger conditions. Error: {error}".format(error=e))
+        data_ids = set()
+        for condition in conditions:
+            data_ids.update(data_id for data_id in (condition.data_id, condition.data2_id) if data_id)
+        return sorted(data_ids)
+
+    def create_group_members(self, group_id, member_ids, data_id_map_template, tags=None, name=None,
+                             description=None, workers=10):
+        """ Creates the missing group members of member_ids, expanding the
+            data_id_map of each member from data_id_map_template and the
+            data_ids of the group trigger conditions, and the member_id in
+            the tags, name and description. The existing members are listed
+            once, and the missing ones are created up to workers at a time
+
+            Returns:
+                whether or not a change took place, a short message and the
+                ids of the created members
+        """
+        import hawkular.alerts
+        from collections import OrderedDict
+        from multiprocessing.pool import ThreadPool
+        if not self.group_trigger_exist(group_id):
+            self.module.fail_json(msg="Failed to create group members, group {group_id} does not exist ".format(group_id=group_id))
+        # a member id listed twice would be created twice, and counted as missing
+        member_ids = list(OrderedDict.fromkeys(member_ids))
+        data_ids = self.group_data_ids(group_id)
+        try:
+            # an orphan member already exists too, creating it again fails
+            existing = set(member.id for member in
+                           self.client.list_trigger_records(['triggers', 'groups', group_id, 'members'],
+                                                            params={'includeOrphans': 'true'}))
+        except Exception as e:
+            self.module.fail_json(msg="Failed to get group member triggers. Error: {error}".format(error=e))
+
+        members = []
+        for member_id in member_ids:
+            if member_id in existing:
+                continue
+            try:
+                member = hawkular.alerts.GroupMemberInfo()
+                member.group_id = group_id
+                member.member_id = member_id
+                member.member_name = name and name.format(member_id=member_id)
+                member.member_description = description and description.format(member_id=member_id)
+                member.data_id_map = dict((data_id, data_id_map_template.format(data_id=data_id, member_id=member_id))
+                                          for data_id in data_ids)
+                member.member_tags = tags and dict((k, v.format(member_id=member_id) if hasattr(v, 'format') else v)
+                                                    for k, v in tags.items())
+            except (KeyError, IndexError, ValueError) as e:
+                self.module.fail_json(msg="Failed to expand group member {id}. Error: {error}".format(id=member_id, error=e))
+            members.append(member)
+
+        def create(member):
+            try:
+                self.client.create_group_member(member)
+            except Exception as e:
+                return member.member_id, e
+            return member.member_id, None
+
+        results = []
+        if members:
+            pool = ThreadPool(min(workers, len(members)))
+            try:
+                results = pool.map(create, members)
+            finally:
+                pool.close()
+        created = [member_id for member_id, error in results if error is None]
+        if created:
+            self.changed = True
+        errors = ["{id}: {error}".format(id=member_id, error=error) for member_id, error in results if error is not None]
+        if errors:
+            self.module.fail_json(msg="Failed to create group members. Errors: {errors}".format(errors='; '.join(errors)),
+                                  changed=self.changed, created=created)
+        return dict(
+            msg="Successfully created {created} group members, {existing} already exist in group {group_id}".format(
+                created=len(created), existing=len(member_ids) - len(members), group_id=group_id),
+            changed=self.changed,
+            created=created)
+
 
 def main():
     module = AnsibleModule(
@@ -221,58 +453,117 @@ def main():
                 default=os.environ.get('HAWKULAR_PORT'), type='int'),
             hawkular_api_auth_token=dict(
                 default=os.environ.get('HAWKULAR_TOKEN'), type='str', no_log=True),
-            tenant=dict(required=True, type='str'),
+            tenant=dict(required=False, type='str'),
+            tenants=dict(required=False, type='list'),
+            tenant_concurrency=dict(required=False, type='int', default=10),
             state=dict(required=True, type='str', choices=['present', 'absent', 'list']),
             group_id=dict(required=True, type='str'),
             id=dict(required=False, type='str'),
             name=dict(required=False, type='str'),
             description=dict(required=False, type='str'),
             data_id_map=dict(required=False, type='dict'),
+            member_ids=dict(required=False, type='list', elements='str'),
+            data_id_map_template=dict(required=False, type='str'),
+            member_concurrency=dict(required=False, type='int', default=10),
             tags=dict(required=False, type='dict'),
             scheme=dict(required=False, type='str', choices=['https', 'http'], default='https'),
             ca_file_path=dict(required=False, type='str'),
             verify_ssl=dict(required=False, type='bool', default=True),
+            max_requests_per_second=dict(required=False, type='float'),
+            rate_limit_file=dict(required=False, type='path'),
+            accept_gzip=dict(required=False, type='bool', default=True),
+            gzip_request_min_size=dict(required=False, type='int'),
+            profile_output=dict(required=False, type='path'),
+            output_path=dict(required=False, type='path'),
         ),
-        required_if=[('state', 'present', ['id', 'data_id_map'])],
+        required_one_of=[['tenant', 'tenants']],
+        mutually_exclusive=[['tenant', 'tenants'], ['tenants', 'output_path'], ['id', 'member_ids'],
+                            ['data_id_map', 'data_id_map_template']],
+        required_together=[['member_ids', 'data_id_map_template']],
+        required_if=[
+            ('state', 'absent', ['id'])
+        ],
     )
 
     for arg in ['hawkular_api_hostname', 'hawkular_api_port', 'hawkular_api_auth_token']:
         if module.params[arg] in (None, ''):
             module.fail_json(msg="missing required argument: {}".format(arg))
 
+    for arg in ['tenant_concurrency', 'member_concurrency']:
+        if module.params[arg] < 1:
+            module.fail_json(msg="{arg} must be at least 1, got: {value}".format(arg=arg, value=module.params[arg]))
+
     hostname    = module.params['hawkular_api_hostname']
     port        = module.params['hawkular_api_port']
     token       = module.params['hawkular_api_auth_token']
     tenant      = module.params['tenant']
+    tenants     = module.params['tenants']
+    workers     = module.params['tenant_concurrency']
     group_id    = module.params['group_id']
     id          = module.params['id']
     name        = module.params['name']
     description = module.params['description']
     data_id_map = module.params['data_id_map']
+    member_ids  = module.params['member_ids']
+    template    = module.params['data_id_map_template']
+    creators    = module.params['member_concurrency']
     tags        = module.params['tags']
     scheme      = module.params['scheme']
     state       = module.params['state']
     verify_ssl  = module.params['verify_ssl']
     ca_file     = module.params['ca_file_path']
+    max_rate    = module.params['max_requests_per_second']
+    rate_file   = module.params['rate_limit_file']
+    compressed  = module.params['accept_gzip']
+    gzip_min    = module.params['gzip_request_min_size']
+    profile     = module.params['profile_output']
+    output_path = module.params['output_path']
+
+    if member_ids is not None and state != "present":
+        module.fail_json(msg="member_ids is only supported with state present")
+    missing = [arg for arg in ['id', 'data_id_map'] if module.params[arg] is None]
+    if state == "present" and member_ids is None and missing:
+        module.fail_json(msg="state is present but all of the following are missing: {}".format(', '.join(missing)))
+
+    profiler = None
+    if profile:
+        profiler = RunProfiler(profile)
+        profiler.start()
 
-    context = None
-    if not verify_ssl:
-        context = ssl._create_unverified_context()
-    elif ca_file:
-        context = ssl.create_default_context(cafile=ca_file)
+    context = ssl_context(verify_ssl, ca_file)
+    rate_limiter = create_rate_limiter(max_rate, rate_file, hostname, port)
+    client_options = dict(rate_limiter=rate_limiter, accept_gzip=compressed, gzip_request_min_size=gzip_min)
 
-    hawkular_alerts = HawkularAlertsGroupMember(module, tenant, hostname, port, scheme, token, context)
+    def reconcile(tenant_module, tenant):
+        hawkular_alerts = HawkularAlertsGroupMember(tenant_module, tenant, hostname, port, scheme, token, context, **client_options)
 
-    if state == "present":
-        res_args = hawkular_alerts.create_group_member(group_id, id, data_id_map, tags, name, description)
-    elif state == "absent":
-        res_args = hawkular_alerts.delete_group_member(group_id, id)
-    elif state == "list":
-        res_args = hawkular_alerts.list_group_members(group_id)
+        if state == "present" and member_ids is not None:
+            res_args = hawkular_alerts.create_group_members(group_id, member_ids, template, tags, name, description, creators)
+        elif state == "present":
+            res_args = hawkular_alerts.create_group_member(group_id, id, data_id_map, tags, name, description)
+        elif state == "absent":
+            res_args = hawkular_alerts.delete_group_member(group_id, id)
+        elif state == "list":
+            res_args = hawkular_alerts.list_group_members(group_id, output_path)
+        res_args['api_calls'] = hawkular_alerts.api_calls
+        return res_args
+
+    if tenants:
+        if profiler is not None:
+            reconcile = profiler.wrap(reconcile)
+        res_args = reconcile_tenants(module, tenants, reconcile, workers)
+    else:
+        try:
+            res_args = reconcile(module, tenant)
+        except RateLimitError as e:
+            module.fail_json(msg=str(e))
     module.exit_json(**res_args)
 
 
 # Import module bits
-from ansible.module_utils.basic import *
+from ansible.module_utils.basic import AnsibleModule
+from ansible.module_utils.hawkular_alerts import (RateLimitError, RunProfiler, create_client,
+                                                  create_rate_limiter, reconcile_tenants, ssl_context, to_dicts,
+                                                  write_json_lines)
 if __name__ == "__main__":
     main()
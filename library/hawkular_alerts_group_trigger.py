@@ -27,7 +27,20 @@ options:
   tenant:
     description:
       - the hawkular tenant
-    required: True
+      - Either tenant or tenants is required
+    required: False
+  tenants:
+    description:
+      - a list of hawkular tenants to apply the same state to
+      - The tenants are handled concurrently, each with its own client, and
+        the result of each tenant is returned under results, by tenant
+    required: False
+    default: null
+  tenant_concurrency:
+    description:
+      - the maximum number of tenants handled at the same time, at least 1
+    required: False
+    default: 10
   name:
     description:
       - the group trigger name
@@ -42,7 +55,41 @@ options:
     description:
       - the group trigger id. This is the primary field on which one matches
         an existing trigger
-    required: True
+      - Either group_id or group_ids is required
+    required: False
+  group_ids:
+    description:
+      - On absent, the ids of the group triggers to delete, one after the
+        other. The member triggers of each group trigger are deleted
+        concurrently, in batches, before the group trigger itself
+      - Group triggers that don't exist are reported under results, without
+        a change
+    required: False
+    default: null
+  keep_non_orphans:
+    description:
+      - On absent, keep the non-orphan member triggers of the deleted group
+        triggers, which the server converts to standard triggers. Orphan
+        member triggers are deleted either way
+    required: False
+    default: False
+  delete_concurrency:
+    description:
+      - On absent with group_ids, the maximum number of member trigger
+        deletes sent at the same time, at least 1
+    required: False
+    default: 10
+  delete_batch_size:
+    description:
+      - On absent with group_ids, the number of member triggers deleted
+        before logging the progress of the group trigger to the module log,
+        at least 1
+      - The progress only goes to the module log, which is the syslog or
+        journal of the host running the module, not the task output. The
+        result of each group trigger only holds the final members_deleted
+        and members_kept counts
+    required: False
+    default: 100
   severity:
     description:
       - the group trigger severity
@@ -75,7 +122,7 @@ options:
       - On present, it will create the group trigger
         if it does not exist, or update it if needed
       - On absent, it will delete the group trigger,
-        if it exists
+        if it exists, or the group triggers in group_ids
       - On list, it will return all triggers in the tenant
     required: True
     choices: ['present', 'absent', 'list']
@@ -100,6 +147,74 @@ options:
       - the path to a ca file
     required: false
     default: null
+  force_compare:
+    description:
+      - On present, the fingerprint of the applied group trigger attributes
+        and conditions is kept in the group trigger context, and a group
+        trigger holding the fingerprint of the same desired values is left
+        as is after a single request
+      - Set to compare the group trigger and its conditions anyway, such as
+        after they were changed outside of Ansible
+      - The fingerprint only covers the group trigger attributes and
+        conditions. The dampenings module keeps its own fingerprint, and the
+        group members are not fingerprinted
+      - A group trigger created before the fingerprints gets its fingerprint
+        on the first run, even when nothing else changed. That update is
+        cascaded by the server to every member trigger, so it is reported as
+        a change, along with fingerprint_stored
+    required: false
+    default: false
+  output_path:
+    description:
+      - On list, write the triggers to this file as JSON lines, one trigger
+        per line, instead of returning them in the module result
+      - The triggers are requested page_size at a time, and each page is
+        written as it arrives
+      - Only the number of listed triggers and the path are returned
+    required: false
+    default: null
+  page_size:
+    description:
+      - On list with output_path, the number of triggers requested per page,
+        at least 1. The pages are requested sorted by trigger id
+    required: false
+    default: 1000
+  max_requests_per_second:
+    description:
+      - the maximum rate of requests sent to the hawkular API
+      - The limit is a token bucket shared through rate_limit_file by every
+        module process and tenant on the host running the module, so it
+        holds when raising forks
+    required: false
+    default: null
+  rate_limit_file:
+    description:
+      - the state file of the request rate limit, every module process
+        using the same file shares the same limit
+    required: false
+    default: a file per user, API hostname and port in the system temp directory
+  accept_gzip:
+    description:
+      - whether to ask the hawkular API for gzip compressed responses, which
+        are decompressed as they are read
+    required: false
+    default: True
+  gzip_request_min_size:
+    description:
+      - gzip compress request bodies of at least this many bytes, such as
+        large condition and member payloads
+      - The hawkular server must be configured to accept gzip encoded
+        requests, request bodies are not compressed by default
+    required: false
+    default: null
+  profile_output:
+    description:
+      - write a cProfile profile of the module run to this path on the
+        host running the module, which can be read with python -m pstats
+      - The profile covers the hawkular client import, SSL setup, requests
+        and comparisons, and with tenants the reconcile of every tenant
+    required: false
+    default: null
 '''
 
 EXAMPLES = '''
@@ -127,47 +242,105 @@ EXAMPLES = '''
       data_id: 'example_condition'
       operator: 'GT'
       threshold: 0.8
+
+# Delete the group triggers of a decommissioned service
+  hawkular_alerts_group:
+    hawkular_api_hostname: 'hawkular-endpoint.example.com'
+    port: 443
+    token: '******'
+    tenant: '_system'
+    group_ids:
+    - 'example-group-trigger'
+    - 'other-group-trigger'
+    state: 'absent'
+    delete_concurrency: 20
+
+# List all triggers of a large tenant into a file
+  hawkular_alerts_group:
+    hawkular_api_hostname: 'hawkular-endpoint.example.com'
+    port: 443
+    token: '******'
+    tenant: '_system'
+    group_id: 'example-group-trigger'
+    state: 'list'
+    output_path: /tmp/triggers.jsonl
 '''
 
 import os
-import ssl
-import urllib2
-import hawkular.alerts
+
+FINGERPRINT_KEY = 'ansible.trigger.fingerprint'
 
 
 class HawkularAlertsGroupTrigger(object):
     """ Hawkular Alerts object to create, update and delete group triggers in Hawkular
     """
-    def __init__(self, module, tenant, hostname, port, scheme, token, context):
+    def __init__(self, module, tenant, hostname, port, scheme, token, context, **client_options):
         self.module  = module
-        self.client  = hawkular.alerts.HawkularAlertsClient(tenant, host=hostname, port=port, scheme=scheme, token=token, context=context)
         self.changed = False
+        self._tenant = tenant
+        self._client = None
+        self._client_options = dict(client_options, host=hostname, port=port, scheme=scheme, token=token,
+                                    context=context)
+
+    @property
+    def client(self):
+        """ The hawkular alerts client, created on first use
+        """
+        if self._client is None:
+            self._client = create_client(self._tenant, **self._client_options)
+        return self._client
 
-    def list_triggers(self):
+    @property
+    def api_calls(self):
+        """ The number of requests sent to the hawkular API so far
         """
+        return self._client.api_calls if self._client is not None else 0
+
+    def list_triggers(self, output_path=None, page_size=1000):
+        """ Lists the triggers of the tenant. When output_path is passed, the
+            triggers are listed page_size at a time, and each page is written
+            to output_path as it arrives
+
             Returns:
-                All triggers in the tenant
+                All triggers in the tenant, or when output_path is passed, the
+                number of triggers written to it as JSON lines
         """
+        import urllib2
+        if output_path is not None:
+            try:
+                count = write_json_lines(output_path, self.client.iter_trigger_records('triggers', page_size))
+            # HTTPError and URLError are IOErrors, they are listing errors rather than write errors
+            except urllib2.URLError as e:
+                self.module.fail_json(msg="Failed to list triggers. Error: {error}".format(error=e))
+            except (IOError, OSError) as e:
+                self.module.fail_json(msg="Failed to write triggers to {path}. Error: {error}".format(path=output_path, error=e))
+            except Exception as e:
+                self.module.fail_json(msg="Failed to list triggers. Error: {error}".format(error=e))
+            return dict(
+                msg="Successfully listed {count} triggers to {path}".format(count=count, path=output_path),
+                changed=self.changed,
+                count=count,
+                output_path=output_path)
         try:
-            triggers = self.client.list_triggers()
+            triggers = self.client.list_trigger_records('triggers')
         except Exception as e:
             self.module.fail_json(msg="Failed to list triggers. Error: {error}".format(error=e))
-        triggers_dicts_list = [vars(trigger) for trigger in triggers]
         return dict(
             msg="Successfully listed triggers",
             changed=self.changed,
-            triggers=triggers_dicts_list)
+            triggers=to_dicts(triggers))
 
-    def delete_group_trigger(self, group_id):
-        """ Deleted a group trigger in Hawkular Alerting component
+    def delete_group_trigger(self, group_id, keep_non_orphans=False):
+        """ Deleted a group trigger in Hawkular Alerting component, a missing
+            group trigger is reported by the delete request itself
 
             Returns:
                 whether or not a change took place and a short message
                 describing the operation executed
         """
+        import urllib2
         try:
-            self.client.get_trigger(group_id)
-            self.client.delete_group_trigger(group_id)
+            self.client.delete_group_trigger(group_id, keep_non_orphans=keep_non_orphans)
             self.changed = True
             return dict(
                 msg="Successfully deleted group trigger {group_id}".format(group_id=group_id),
@@ -182,6 +355,92 @@ class HawkularAlertsGroupTrigger(object):
         except Exception as e:
             self.module.fail_json(msg="Failed to delete group trigger. Error: {error}".format(error=e))
 
+    def delete_group_members(self, group_id, keep_non_orphans, workers, batch_size):
+        """ Deletes the member triggers of a group trigger, orphans included,
+            up to workers at the same time, logging the progress after each
+            batch_size members. Non-orphan members are kept when
+            keep_non_orphans is set. A missing group trigger is reported by
+            the members listing, with a 404
+
+            Returns:
+                the number of deleted member triggers, and the number of kept
+                member triggers
+        """
+        import urllib2
+        from multiprocessing.pool import ThreadPool
+
+        def delete(member_id):
+            try:
+                self.client.delete_trigger(member_id)
+            except urllib2.HTTPError as e:
+                if e.code != 404:
+                    return e
+            except Exception as e:
+                return e
+
+        members = self.client.list_trigger_records(['triggers', 'groups', group_id, 'members'],
+                                                   params={'includeOrphans': 'true'})
+        member_ids = [m.id for m in members if not keep_non_orphans or m.type == 'ORPHAN']
+        deleted = 0
+        if not member_ids:
+            return deleted, len(members)
+        pool = ThreadPool(min(workers, len(member_ids)))
+        try:
+            for start in range(0, len(member_ids), batch_size):
+                batch = member_ids[start:start + batch_size]
+                errors = [e for e in pool.map(delete, batch) if e is not None]
+                deleted += len(batch) - len(errors)
+                if deleted:
+                    self.changed = True
+                if errors:
+                    raise errors[0]
+                self.module.log("Deleted {deleted} of {count} member triggers of group trigger {group_id}".format(
+                    deleted=deleted, count=len(member_ids), group_id=group_id))
+        finally:
+            pool.close()
+        return deleted, len(members) - deleted
+
+    def delete_group_triggers(self, group_ids, keep_non_orphans, workers, batch_size):
+        """ Deletes group triggers one after the other, deleting the member
+            triggers of each group trigger concurrently first, rather than in
+            the server side cascade of the group trigger delete. The progress
+            is logged to the module log after each group trigger
+
+            Returns:
+                whether or not a change took place, a short message and the
+                result of each group trigger, by group id
+        """
+        import urllib2
+        results = {}
+        for count, group_id in enumerate(group_ids, 1):
+            changed = self.changed
+            self.changed = False
+            deleted = kept = 0
+            try:
+                try:
+                    deleted, kept = self.delete_group_members(group_id, keep_non_orphans, workers, batch_size)
+                    self.client.delete_group_trigger(group_id, keep_non_orphans=keep_non_orphans)
+                    self.changed = True
+                    msg = "Successfully deleted group trigger {group_id}".format(group_id=group_id)
+                except urllib2.HTTPError as e:
+                    if e.code != 404:
+                        raise
+                    msg = "Group trigger {group_id} doesn't exist".format(group_id=group_id)
+                results[group_id] = dict(msg=msg, changed=self.changed, members_deleted=deleted, members_kept=kept)
+            except Exception as e:
+                results[group_id] = dict(msg="Failed to delete group trigger. Error: {error}".format(error=e),
+                                         changed=self.changed, failed=True)
+            self.changed = changed or self.changed
+            self.module.log("Deleted {count} of {total} group triggers".format(count=count, total=len(group_ids)))
+        failed_groups = [group_id for group_id in group_ids if results[group_id].get('failed')]
+        if failed_groups:
+            self.module.fail_json(msg="Failed to delete group triggers: {group_ids}".format(group_ids=', '.join(failed_groups)),
+                                  changed=self.changed, results=results)
+        return dict(
+            msg="Successfully deleted {count} group triggers".format(count=len(group_ids)),
+            changed=self.changed,
+            results=results)
+
     def conditions_update_required(self, trigger_id, desired_conditions):
         """ Returns True if an update is required in one or more of the group
             trigger conditions, False otherwise
@@ -224,9 +483,12 @@ class HawkularAlertsGroupTrigger(object):
     def set_group_trigger_conditions(self, group_id, conditions):
         """ Set the conditions for the group trigger
         """
+        import hawkular.alerts
         firing_gc = hawkular.alerts.GroupConditionsInfo()
         autoresolve_gc = hawkular.alerts.GroupConditionsInfo()
         for c in conditions:
+            # copy, the same conditions are set on every tenant of a multi-tenant run
+            c = c.copy()
             name = c.pop("name")
             condition = hawkular.alerts.Condition(c)
             condition.context = {'name': name}
@@ -243,34 +505,58 @@ class HawkularAlertsGroupTrigger(object):
             self.module.fail_json(msg="Failed to set group trigger conditions. Error: {error}".format(error=e))
         self.changed = True
 
-    def update_group_trigger(self, trigger, updates, conditions):
+    def store_fingerprint(self, trigger, fingerprint):
+        """ Stores the fingerprint of the applied spec in the group trigger
+            context, unless it is already there
+
+            Returns:
+                True if the fingerprint was stored, False if it was already there
+        """
+        context = trigger.context or {}
+        if context.get(FINGERPRINT_KEY) == fingerprint:
+            return False
+        trigger.context = dict(context, **{FINGERPRINT_KEY: fingerprint})
+        try:
+            self.client.update_group_trigger(trigger.id, trigger)
+        except Exception as e:
+            self.module.fail_json(msg="Failed to store group trigger fingerprint. Error: {error}".format(error=e))
+        return True
+
+    def update_group_trigger(self, trigger, updates, conditions, fingerprint=None):
         """ Updates a group Trigger in Hawkular Alerts
 
+            The conditions are set first, so the fingerprint is only stored,
+            along with the updated attributes, once everything was applied
+
             Returns:
                 whether or not a change took place and a short message
                 describing the operation executed
         """
+        if conditions is not None:
+            if self.conditions_update_required(trigger.id, conditions):
+                self.set_group_trigger_conditions(trigger.id, conditions)
         for attr in updates:
             setattr(trigger, attr, updates[attr])
+        if fingerprint is not None:
+            trigger.context = dict(trigger.context or {}, **{FINGERPRINT_KEY: fingerprint})
         try:
             self.client.update_group_trigger(trigger.id, trigger)
         except Exception as e:
             self.module.fail_json(msg="Failed to update group trigger. Error: {error}".format(error=e))
-        if conditions is not None:
-            if self.conditions_update_required(trigger.id, conditions):
-                self.set_group_trigger_conditions(trigger.id, conditions)
         self.changed = True
         return dict(
             msg="Successfully updated group trigger {group_id}".format(group_id=trigger.id),
             changed=self.changed)
 
-    def create_group_trigger(self, group_id, name, event_text, severity, auto_resolve, tags, enabled, conditions):
+    def create_group_trigger(self, group_id, name, event_text, severity, auto_resolve, tags, enabled, conditions,
+                             fingerprint=None):
         """ Creates a group Trigger in Hawkular Alerts
 
             Returns:
                 whether or not a change took place and a short message
                 describing the operation executed
         """
+        import hawkular.alerts
         #  create trigger object
         trigger = hawkular.alerts.Trigger()
         trigger.id = group_id
@@ -288,26 +574,44 @@ class HawkularAlertsGroupTrigger(object):
         self.changed = True
         if conditions:
             self.set_group_trigger_conditions(group_id, conditions)
+        if fingerprint is not None:
+            self.store_fingerprint(trigger, fingerprint)
         return dict(
             msg="Successfully created group trigger {group_id}".format(group_id=group_id),
             changed=self.changed)
 
     def create_or_update_group_trigger(self, name, group_id, event_text, severity, auto_resolve, tags, enabled,
-                                       conditions):
+                                       conditions, force_compare=False):
         """ Creates or updates a group trigger in Hawkular Alerts
 
+            Unless force_compare is set, a group trigger whose context holds
+            the fingerprint of the same desired values is left as is, without
+            comparing its attributes and conditions
+
             Returns:
                 whether or not a change took place and a short message
                 describing the operation executed
         """
+        import urllib2
+        fingerprint = spec_fingerprint({"name": name,
+                                        "event_text": event_text,
+                                        "severity": severity,
+                                        "auto_resolve": auto_resolve,
+                                        "tags": tags,
+                                        "enabled": enabled,
+                                        "conditions": conditions and sorted(conditions, key=lambda k: k['name'])})
         try:
             gt = self.client.get_trigger(group_id)
         except urllib2.HTTPError as err:
             if err.code == 404:
                 return self.create_group_trigger(group_id, name, event_text, severity, auto_resolve,
-                                                 tags, enabled, conditions)
+                                                 tags, enabled, conditions, fingerprint)
             else:
                 raise
+        if not force_compare and (gt.context or {}).get(FINGERPRINT_KEY) == fingerprint:
+            return dict(
+                msg="Group trigger {group_id} matches the last applied spec, nothing to change.".format(group_id=group_id),
+                changed=self.changed)
         updates = self.required_updates(gt, {"name": name,
                                              "event_text": event_text,
                                              "severity": severity,
@@ -317,16 +621,22 @@ class HawkularAlertsGroupTrigger(object):
         if not updates:
             if conditions is not None and self.conditions_update_required(group_id, conditions):
                 self.set_group_trigger_conditions(group_id, conditions)
+                self.store_fingerprint(gt, fingerprint)
                 self.changed = True
                 return dict(
                     msg="Updated group trigger {group_id} conditions".format(group_id=group_id),
                     changed=self.changed)
             else:
+                # a group trigger applied before the fingerprints, the update is cascaded to its members
+                stored = self.store_fingerprint(gt, fingerprint)
+                if stored:
+                    self.changed = True
                 return dict(
                     msg="Group trigger {group_id} already exist, nothing to change.".format(group_id=group_id),
-                    changed=self.changed)
+                    changed=self.changed,
+                    fingerprint_stored=stored)
         else:
-            return self.update_group_trigger(gt, updates, conditions)
+            return self.update_group_trigger(gt, updates, conditions, fingerprint)
 
 
 def main():
@@ -338,10 +648,16 @@ def main():
                 default=os.environ.get('HAWKULAR_PORT'), type='int'),
             hawkular_api_auth_token=dict(
                 default=os.environ.get('HAWKULAR_TOKEN'), type='str', no_log=True),
-            tenant=dict(required=True, type='str'),
+            tenant=dict(required=False, type='str'),
+            tenants=dict(required=False, type='list'),
+            tenant_concurrency=dict(required=False, type='int', default=10),
             name=dict(type='str'),
             event_text=dict(required=False, type='str'),
-            group_id=dict(required=True, type='str'),
+            group_id=dict(required=False, type='str'),
+            group_ids=dict(required=False, type='list'),
+            keep_non_orphans=dict(required=False, type='bool', default=False),
+            delete_concurrency=dict(required=False, type='int', default=10),
+            delete_batch_size=dict(required=False, type='int', default=100),
             severity=dict(type='str'),
             auto_resolve=dict(required=False, type='bool', default=False),
             tags=dict(required=False, type='dict'),
@@ -350,8 +666,18 @@ def main():
             enabled=dict(required=False, type='bool', default=True),
             ca_file_path=dict(required=False, type='str'),
             verify_ssl=dict(required=False, type='bool', default=True),
+            max_requests_per_second=dict(required=False, type='float'),
+            rate_limit_file=dict(required=False, type='path'),
+            accept_gzip=dict(required=False, type='bool', default=True),
+            gzip_request_min_size=dict(required=False, type='int'),
+            profile_output=dict(required=False, type='path'),
             conditions=dict(required=False, type='list'),
+            force_compare=dict(required=False, type='bool', default=False),
+            output_path=dict(required=False, type='path'),
+            page_size=dict(required=False, type='int', default=1000),
         ),
+        required_one_of=[['tenant', 'tenants'], ['group_id', 'group_ids']],
+        mutually_exclusive=[['tenant', 'tenants'], ['tenants', 'output_path'], ['group_id', 'group_ids']],
         required_if=[
             ('state', 'present', ['name', 'severity'])
         ],
@@ -361,14 +687,24 @@ def main():
         if module.params[arg] in (None, ''):
             module.fail_json(msg="missing required argument: {}".format(arg))
 
+    for arg in ['tenant_concurrency', 'delete_concurrency', 'delete_batch_size', 'page_size']:
+        if module.params[arg] < 1:
+            module.fail_json(msg="{arg} must be at least 1, got: {value}".format(arg=arg, value=module.params[arg]))
+
     hostname     = module.params['hawkular_api_hostname']
     port         = module.params['hawkular_api_port']
     token        = module.params['hawkular_api_auth_token']
     tenant       = module.params['tenant']
+    tenants      = module.params['tenants']
+    workers      = module.params['tenant_concurrency']
     name         = module.params['name']
     event_text   = module.params['event_text']
     group_id     = module.params['group_id']
-    severity     = getattr(hawkular.alerts.Severity, module.params['severity'].upper())
+    group_ids    = module.params['group_ids']
+    keep_members = module.params['keep_non_orphans']
+    deleters     = module.params['delete_concurrency']
+    batch_size   = module.params['delete_batch_size']
+    severity     = module.params['severity'] and module.params['severity'].upper()
     auto_resolve = module.params['auto_resolve']
     tags         = module.params['tags']
     scheme       = module.params['scheme']
@@ -376,26 +712,63 @@ def main():
     enabled      = module.params['enabled']
     verify_ssl   = module.params['verify_ssl']
     ca_file      = module.params['ca_file_path']
+    max_rate     = module.params['max_requests_per_second']
+    rate_file    = module.params['rate_limit_file']
+    compressed   = module.params['accept_gzip']
+    gzip_min     = module.params['gzip_request_min_size']
+    profile      = module.params['profile_output']
     conditions   = module.params['conditions']
-
-    context = None
-    if not verify_ssl:
-        context = ssl._create_unverified_context()
-    elif ca_file:
-        context = ssl.create_default_context(cafile=ca_file)
-
-    hawkular_alerts = HawkularAlertsGroupTrigger(module, tenant, hostname, port, scheme, token, context)
-
-    if state == "present":
-        res_args = hawkular_alerts.create_or_update_group_trigger(name, group_id, event_text, severity, auto_resolve, tags, enabled, conditions)
-    elif state == "absent":
-        res_args = hawkular_alerts.delete_group_trigger(group_id)
-    elif state == "list":
-        res_args = hawkular_alerts.list_triggers()
+    force        = module.params['force_compare']
+    output_path  = module.params['output_path']
+    page_size    = module.params['page_size']
+
+    # matches the hawkular.alerts.Severity values, without importing the client on startup
+    if severity not in (None, 'LOW', 'MEDIUM', 'HIGH', 'CRITICAL'):
+        module.fail_json(msg="severity can be 'LOW', 'MEDIUM', 'HIGH' or 'CRITICAL', got: {severity}".format(
+            severity=module.params['severity']))
+
+    if group_ids and state != "absent":
+        module.fail_json(msg="group_ids is only supported with state absent")
+
+    profiler = None
+    if profile:
+        profiler = RunProfiler(profile)
+        profiler.start()
+
+    context = ssl_context(verify_ssl, ca_file)
+    rate_limiter = create_rate_limiter(max_rate, rate_file, hostname, port)
+    client_options = dict(rate_limiter=rate_limiter, accept_gzip=compressed, gzip_request_min_size=gzip_min)
+
+    def reconcile(tenant_module, tenant):
+        hawkular_alerts = HawkularAlertsGroupTrigger(tenant_module, tenant, hostname, port, scheme, token, context, **client_options)
+
+        if state == "present":
+            res_args = hawkular_alerts.create_or_update_group_trigger(name, group_id, event_text, severity, auto_resolve, tags, enabled, conditions, force)
+        elif state == "absent" and group_ids:
+            res_args = hawkular_alerts.delete_group_triggers(group_ids, keep_members, deleters, batch_size)
+        elif state == "absent":
+            res_args = hawkular_alerts.delete_group_trigger(group_id, keep_members)
+        elif state == "list":
+            res_args = hawkular_alerts.list_triggers(output_path, page_size)
+        res_args['api_calls'] = hawkular_alerts.api_calls
+        return res_args
+
+    if tenants:
+        if profiler is not None:
+            reconcile = profiler.wrap(reconcile)
+        res_args = reconcile_tenants(module, tenants, reconcile, workers)
+    else:
+        try:
+            res_args = reconcile(module, tenant)
+        except RateLimitError as e:
+            module.fail_json(msg=str(e))
     module.exit_json(**res_args)
 
 
 # Import module bits
-from ansible.module_utils.basic import *
+from ansible.module_utils.basic import AnsibleModule
+from ansible.module_utils.hawkular_alerts import (RateLimitError, RunProfiler, create_client,
+                                                  create_rate_limiter, reconcile_tenants, spec_fingerprint,
+                                                  ssl_context, to_dicts, write_json_lines)
 if __name__ == "__main__":
     main()
@@ -0,0 +1,165 @@
+# Lookup plugin returning Hawkular Alerts triggers, backed by a cache plugin
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+DOCUMENTATION = '''
+---
+lookup: hawkular_triggers
+short_description: Returns triggers or group member triggers from Hawkular Alerts
+description:
+  - With no terms, returns all triggers in the tenant
+  - With group trigger ids as terms, returns the member triggers of those groups
+  - The listing is done by the hawkular_alerts_group_trigger and
+    hawkular_alerts_group_member modules' classes, and results are kept in
+    the configured cache plugin for cache_timeout seconds, so repeated plays
+    do not query the server again
+requirements: [ hawkular/hawkular-client-python ]
+author: Daniel Korn (@dkorn)
+options:
+  _terms:
+    description:
+      - group trigger ids whose member triggers should be returned
+    required: False
+  hawkular_api_hostname:
+    description:
+      - the hawkular API hostname
+    default: HAWKULAR_HOSTNAME env var
+  hawkular_api_port:
+    description:
+      - the hawkular API port
+    default: HAWKULAR_PORT env var
+  hawkular_api_auth_token:
+    description:
+      - the hawkular API auth token
+    default: HAWKULAR_TOKEN env var
+  tenant:
+    description:
+      - the hawkular tenant
+    required: True
+  scheme:
+    description:
+      - the hawkular scheme
+    default: 'https'
+    choices: ['https', 'http']
+  verify_ssl:
+    description:
+      - whether SSL certificates should be verified for HTTPS requests
+    default: True
+  ca_file_path:
+    description:
+      - the path to a ca file
+    default: null
+  cache_plugin:
+    description:
+      - the cache plugin to keep results in, defaults to the fact caching plugin
+      - A single instance of each cache plugin and connection is kept, so the
+        memory cache plugin keeps the results for the life of the process
+        running the lookup. Use a persistent cache plugin, such as jsonfile,
+        to keep them across tasks and plays
+    default: fact_caching setting
+  cache_connection:
+    description:
+      - the cache plugin connection, defaults to the fact caching connection
+    default: fact_caching_connection setting
+  cache_timeout:
+    description:
+      - number of seconds results are served from the cache, 0 disables caching
+    default: 300
+'''
+
+EXAMPLES = '''
+- name: all triggers in the tenant
+  debug:
+    msg: "{{ lookup('hawkular_triggers', tenant='_system', wantlist=True) | map(attribute='id') | list }}"
+
+- name: member triggers of a group, cached for ten minutes in the jsonfile cache
+  debug:
+    msg: "{{ lookup('hawkular_triggers', 'test_group-01', tenant='_system', cache_plugin='jsonfile',
+                    cache_connection='/tmp/hawkular_cache', cache_timeout=600, wantlist=True) }}"
+'''
+
+import os
+import imp
+import time
+import hashlib
+
+from ansible import constants as C
+from ansible.errors import AnsibleError
+from ansible.plugins.loader import cache_loader
+from ansible.plugins.lookup import LookupBase
+
+imp.load_source('hawkular_alerts_path', os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                                    'module_utils', 'hawkular_alerts_path.py'))
+
+from ansible.module_utils.hawkular_alerts import PluginModule, load_library_module, ssl_context
+
+# the cache plugins by plugin, connection and timeout, a new instance of the
+# memory cache plugin would be empty on every lookup
+CACHES = {}
+
+
+class LookupModule(LookupBase):
+
+    def get_cache(self, cache_plugin, cache_uri, cache_ttl):
+        """ Returns:
+                the instance of the cache plugin cache_plugin for cache_uri and
+                cache_ttl, loaded on its first use
+        """
+        key = (cache_plugin, cache_uri, cache_ttl)
+        if key not in CACHES:
+            cache = cache_loader.get(cache_plugin, _uri=cache_uri, _timeout=cache_ttl, _prefix='hawkular_triggers_')
+            if cache is None:
+                raise AnsibleError("Unable to load the cache plugin {0}".format(cache_plugin))
+            CACHES[key] = cache
+        return CACHES[key]
+
+    def run(self, terms, variables=None, **kwargs):
+        hostname     = kwargs.get('hawkular_api_hostname', os.environ.get('HAWKULAR_HOSTNAME'))
+        port         = kwargs.get('hawkular_api_port', os.environ.get('HAWKULAR_PORT'))
+        token        = kwargs.get('hawkular_api_auth_token', os.environ.get('HAWKULAR_TOKEN'))
+        tenant       = kwargs.get('tenant')
+        scheme       = kwargs.get('scheme', 'https')
+        verify_ssl   = kwargs.get('verify_ssl', True)
+        ca_file      = kwargs.get('ca_file_path')
+        cache_plugin = kwargs.get('cache_plugin', C.CACHE_PLUGIN)
+        cache_uri    = kwargs.get('cache_connection', C.CACHE_PLUGIN_CONNECTION)
+        cache_ttl    = int(kwargs.get('cache_timeout', 300))
+
+        for arg, value in [('hawkular_api_hostname', hostname), ('hawkular_api_port', port),
+                           ('hawkular_api_auth_token', token), ('tenant', tenant)]:
+            if value in (None, ''):
+                raise AnsibleError("missing required argument: {}".format(arg))
+
+        cache = None
+        cache_key = hashlib.sha1("{0}|{1}|{2}|{3}|{4}".format(
+            scheme, hostname, port, tenant, ','.join(terms)).encode('utf-8')).hexdigest()
+        if cache_ttl > 0:
+            cache = self.get_cache(cache_plugin, cache_uri, cache_ttl)
+            cached = None
+            # the file cache plugins warn on the get of a missing key
+            if cache.contains(cache_key):
+                try:
+                    cached = cache.get(cache_key)
+                except KeyError:
+                    pass
+            # the memory cache plugin does not expire its keys
+            if isinstance(cached, dict) and time.time() - cached.get('time', 0) <= cache_ttl:
+                return cached['results']
+
+        context = ssl_context(verify_ssl, ca_file)
+
+        if terms:
+            group_member_class = load_library_module('hawkular_alerts_group_member').HawkularAlertsGroupMember
+            hawkular_alerts = group_member_class(PluginModule(), tenant, hostname, int(port), scheme, token, context)
+            results = []
+            for group_id in terms:
+                results.extend(hawkular_alerts.list_group_members(group_id)['group_members'])
+        else:
+            group_trigger_class = load_library_module('hawkular_alerts_group_trigger').HawkularAlertsGroupTrigger
+            hawkular_alerts = group_trigger_class(PluginModule(), tenant, hostname, int(port), scheme, token, context)
+            results = hawkular_alerts.list_triggers()['triggers']
+
+        if cache is not None:
+            cache.set(cache_key, dict(time=time.time(), results=results))
+        return results
@@ -0,0 +1,452 @@
+# Shared by the hawkular_alerts modules and plugins: the hawkular alerts
+# client the modules use, with its rate limit and gzip support, and the
+# helpers of multi-tenant runs, listings and profiling
+
+from __future__ import absolute_import
+
+import os
+import io
+import sys
+import zlib
+import codecs
+import base64
+import time
+import fcntl
+import json
+import hashlib
+
+LIBRARY_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'library')
+
+
+class RateLimiter(object):
+    """ Token bucket limiting requests to rate per second, with a burst of up
+        to rate requests. The bucket state is kept in a file, read and written
+        under an exclusive flock, so it is shared by every process using it
+    """
+    def __init__(self, rate, path):
+        self.rate = rate
+        self.path = path
+
+    def take(self):
+        """ Takes a token from the bucket, if there is one
+
+            Returns:
+                0 if a token was taken, otherwise the number of seconds
+                until a token is available
+        """
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            now = time.time()
+            try:
+                tokens, last = [float(v) for v in os.read(fd, 64).split()]
+            except ValueError:
+                tokens, last = self.rate, now
+            tokens = min(max(self.rate, 1.0), tokens + (now - last) * self.rate)
+            wait = 0
+            if tokens >= 1:
+                tokens -= 1
+            else:
+                wait = (1 - tokens) / self.rate
+            os.lseek(fd, 0, os.SEEK_SET)
+            os.ftruncate(fd, 0)
+            os.write(fd, "{tokens!r} {now!r}".format(tokens=tokens, now=now).encode('ascii'))
+            return wait
+        finally:
+            os.close(fd)
+
+    def acquire(self):
+        """ Blocks until a token is taken from the bucket
+        """
+        wait = self.take()
+        while wait > 0:
+            time.sleep(wait)
+            wait = self.take()
+
+
+class RateLimitError(Exception):
+    """ Raised by the client when the rate limiter fails to take a token, so
+        the modules fail on it instead of exiting with a traceback
+    """
+    pass
+
+
+class GzipResponseReader(object):
+    """ File-like object decompressing a gzip encoded response as it is read
+    """
+    def __init__(self, fp, chunk_size=64 * 1024):
+        self.fp           = fp
+        self.chunk_size   = chunk_size
+        self.decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        self.buffer       = b''
+
+    def read(self, size=-1):
+        while size < 0 or len(self.buffer) < size:
+            chunk = self.fp.read(self.chunk_size)
+            if not chunk:
+                self.buffer += self.decompressor.flush()
+                break
+            self.buffer += self.decompressor.decompress(chunk)
+        if size < 0:
+            data, self.buffer = self.buffer, b''
+        else:
+            data, self.buffer = self.buffer[:size], self.buffer[size:]
+        return data
+
+    def close(self):
+        self.fp.close()
+
+
+def gzip_compress(data):
+    """ Returns:
+            data compressed in the gzip format
+    """
+    compressor = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    return compressor.compress(data) + compressor.flush()
+
+
+class TriggerRecord(object):
+    """ Compact record of a listed trigger, holding the Trigger fields in
+        slots, built straight from the trigger's JSON
+    """
+    FIELDS = [
+        ('id', 'id'), ('name', 'name'), ('description', 'description'), ('type', 'type'),
+        ('event_type', 'eventType'), ('event_category', 'eventCategory'), ('event_text', 'eventText'),
+        ('severity', 'severity'), ('context', 'context'), ('tags', 'tags'), ('actions', 'actions'),
+        ('auto_disable', 'autoDisable'), ('auto_enable', 'autoEnable'), ('auto_resolve', 'autoResolve'),
+        ('auto_resolve_alerts', 'autoResolveAlerts'), ('auto_resolve_match', 'autoResolveMatch'),
+        ('data_id_map', 'dataIdMap'), ('member_of', 'memberOf'), ('enabled', 'enabled'),
+        ('firing_match', 'firingMatch'), ('source', 'source')
+    ]
+    __slots__ = [field for field, _ in FIELDS]
+
+    def __init__(self, trigger_json):
+        for field, json_field in self.FIELDS:
+            setattr(self, field, trigger_json.get(json_field))
+
+    def to_dict(self):
+        """ Returns:
+                the record as a dictionary, with the same keys as vars() of a Trigger
+        """
+        return dict((field, getattr(self, field)) for field in self.__slots__)
+
+
+def to_dicts(records):
+    """ Replaces each of the records by its dictionary, in place, so records
+        are released as they are converted
+
+        Returns:
+            the list of dictionaries
+    """
+    for i, record in enumerate(records):
+        records[i] = record.to_dict()
+    return records
+
+
+class ModuleClientMixin(object):
+    """ Mixed into HawkularAlertsClient by create_client, acquiring from the
+        rate limiter, if one is set, before sending each request, and
+        supporting gzip compressed requests and responses
+    """
+    def __init__(self, tenant_id, rate_limiter=None, accept_gzip=True, gzip_request_min_size=None, **kwargs):
+        import hawkular.alerts
+        self.rate_limiter          = rate_limiter
+        self.accept_gzip           = accept_gzip
+        self.gzip_request_min_size = gzip_request_min_size
+        self.api_calls             = 0
+        # member triggers are deleted and created from several threads sharing the client
+        import threading
+        self.api_calls_lock        = threading.Lock()
+        # the default path is derived from the class name
+        kwargs.setdefault('path', 'hawkular/alerts')
+        hawkular.alerts.HawkularAlertsClient.__init__(self, tenant_id, **kwargs)
+
+    def _http(self, url, method, data=None, decoder=None, parse_json=True):
+        """ Same as HawkularBaseClient._http, with the gzip content encodings
+        """
+        try:
+            from urllib2 import Request, urlopen, HTTPError
+        except ImportError:
+            from urllib.request import Request, urlopen
+            from urllib.error import HTTPError
+        if self.rate_limiter is not None:
+            try:
+                self.rate_limiter.acquire()
+            except (IOError, OSError) as e:
+                raise RateLimitError("Failed to acquire the request rate limit of {path}. Error: {error}".format(
+                    path=self.rate_limiter.path, error=e))
+        with self.api_calls_lock:
+            self.api_calls += 1
+        res = None
+        req = Request(url=url)
+        req.add_header('Content-Type', 'application/json')
+        req.add_header('Hawkular-Tenant', self.tenant_id)
+        req.add_header('Host', self.host)
+        if self.accept_gzip:
+            req.add_header('Accept-Encoding', 'gzip')
+
+        if self.token is not None:
+            req.add_header('Authorization', 'Bearer {0}'.format(self.token))
+        elif self.username is not None:
+            b64 = base64.b64encode((self.username + ':' + self.password).encode('utf-8'))
+            req.add_header('Authorization', 'Basic {0}'.format(b64.decode()))
+
+        if self.authtoken is not None:
+            req.add_header('Hawkular-Admin-Token', self.authtoken)
+
+        if not isinstance(data, str):
+            data = json.dumps(data, indent=2)
+
+        reader = codecs.getreader('utf-8')
+
+        if data:
+            body = data
+            if self.gzip_request_min_size is not None and len(data) >= self.gzip_request_min_size:
+                # bytearray, httplib would otherwise join the binary body to the unicode request headers
+                body = bytearray(gzip_compress(data if isinstance(data, bytes) else data.encode('utf-8')))
+                req.add_header('Content-Encoding', 'gzip')
+            try:
+                req.add_data(body)
+            except AttributeError:
+                req.data = body if isinstance(body, bytearray) else body.encode('utf-8')
+        try:
+            req.get_method = lambda: method
+            res = urlopen(req, context=self.context)
+            stream = res
+            if res.info().get('Content-Encoding') == 'gzip':
+                stream = GzipResponseReader(res)
+
+            if parse_json:
+                if res.getcode() == 200:
+                    data = json.load(reader(stream), cls=decoder)
+                elif res.getcode() == 204:
+                    data = {}
+            else:
+                data = reader(stream).read()
+
+            return data
+
+        except Exception as e:
+            if isinstance(e, HTTPError) and e.fp is not None and e.info().get('Content-Encoding') == 'gzip':
+                e = HTTPError(e.url, e.code, e.msg, e.hdrs, io.BytesIO(GzipResponseReader(e.fp).read()))
+            self._handle_error(e)
+
+        finally:
+            if res:
+                res.close()
+
+    def list_trigger_records(self, path, params=None):
+        """ Lists the triggers at path, with the query params, as
+            TriggerRecords, replacing each trigger JSON by its record as it is
+            converted, instead of building Trigger objects
+
+            Returns:
+                the list of TriggerRecords
+        """
+        triggers = self._get(self._service_url(path, params=params))
+        for i, trigger in enumerate(triggers):
+            triggers[i] = TriggerRecord(trigger)
+        return triggers
+
+    def iter_trigger_records(self, path, page_size, params=None):
+        """ Lists the triggers at path page by page, with the page and
+            per_page query params, so a single page of triggers is held at a
+            time. The triggers are sorted by id, so the pages neither skip
+            nor repeat triggers. The last page is the first one with less
+            than page_size triggers
+
+            Returns:
+                a generator of the TriggerRecords, requesting each page once
+                the records of the previous page were consumed
+        """
+        page = 0
+        while True:
+            triggers = self.list_trigger_records(path, dict(params or {}, page=page, per_page=page_size, sort='id',
+                                                                order='asc'))
+            for trigger in triggers:
+                yield trigger
+            if len(triggers) < page_size:
+                return
+            page += 1
+
+HawkularAlertsModuleClient = None
+
+
+def create_client(tenant, **kwargs):
+    """ Creates a HawkularAlertsModuleClient, importing the hawkular client
+        library on first use, so it is not loaded on module startup
+
+        The alerts API does not depend on the server version, so the status
+        request the client sends to detect it is skipped
+    """
+    global HawkularAlertsModuleClient
+    if HawkularAlertsModuleClient is None:
+        import hawkular.alerts
+        HawkularAlertsModuleClient = type('HawkularAlertsModuleClient',
+                                          (ModuleClientMixin, hawkular.alerts.HawkularAlertsClient), {})
+    kwargs.setdefault('auto_set_legacy_api', False)
+    return HawkularAlertsModuleClient(tenant, **kwargs)
+
+
+def spec_fingerprint(spec):
+    """ Returns:
+            a hash of the desired spec, independent of the order of its keys
+    """
+    return hashlib.sha1(json.dumps(spec, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def write_json_lines(path, records):
+    """ Writes each record to path as a single JSON line, one record at a
+        time, so no intermediate list of dicts is built
+
+        Returns:
+            the number of objects written
+    """
+    count = 0
+    with open(path, 'w') as f:
+        for record in records:
+            f.write(json.dumps(record.to_dict()))
+            f.write("\n")
+            count += 1
+    return count
+
+
+class RunProfiler(object):
+    """ Profiles the module run with cProfile and writes the stats to path
+        when the module exits, merged with the stats of the reconcile threads
+        of a multi-tenant run
+    """
+    def __init__(self, path):
+        import threading
+        self.path = path
+        self.profiles = []
+        self.lock = threading.Lock()
+
+    def new_profile(self):
+        import cProfile
+        profile = cProfile.Profile()
+        with self.lock:
+            self.profiles.append(profile)
+        return profile
+
+    def start(self):
+        """ Profiles the calling thread until the module exits
+        """
+        import atexit
+        atexit.register(self.dump)
+        self.new_profile().enable()
+
+    def wrap(self, func):
+        """ Returns:
+                func, profiled in the thread it is called from
+        """
+        def profiled(*args):
+            return self.new_profile().runcall(func, *args)
+        return profiled
+
+    def dump(self):
+        import pstats
+        stats = pstats.Stats(*self.profiles)
+        stats.dump_stats(self.path)
+
+
+class TenantFailure(Exception):
+    """ Raised in place of fail_json for a single tenant of a multi-tenant run
+    """
+    pass
+
+
+class TenantModule(object):
+    """ Proxies the AnsibleModule for a single tenant of a multi-tenant run,
+        so a failing tenant does not exit the run of the other tenants
+    """
+    def __init__(self, module):
+        self.module = module
+
+    def fail_json(self, msg, **kwargs):
+        raise TenantFailure(msg)
+
+    def __getattr__(self, name):
+        return getattr(self.module, name)
+
+
+def reconcile_tenants(module, tenants, reconcile, workers):
+    """ Runs reconcile(module, tenant) for each of the tenants concurrently,
+        each tenant with its own module object and client
+
+        Returns:
+            whether or not a change took place in any of the tenants, a short
+            message and the result of each tenant, by tenant
+    """
+    def run(tenant):
+        try:
+            return tenant, reconcile(TenantModule(module), tenant)
+        except Exception as e:
+            return tenant, dict(msg=str(e), changed=False, failed=True)
+
+    from multiprocessing.pool import ThreadPool
+    pool = ThreadPool(min(workers, len(tenants)))
+    try:
+        results = dict(pool.map(run, tenants))
+    finally:
+        pool.close()
+    changed = any(result['changed'] for result in results.values())
+    failed_tenants = sorted(tenant for tenant, result in results.items() if result.get('failed'))
+    if failed_tenants:
+        module.fail_json(msg="Failed to reconcile tenants: {tenants}".format(tenants=', '.join(failed_tenants)),
+                         changed=changed, results=results)
+    return dict(
+        msg="Successfully reconciled {count} tenants".format(count=len(tenants)),
+        changed=changed,
+        results=results)
+
+
+def ssl_context(verify_ssl, ca_file):
+    """ Returns:
+            the SSL context of the client, None for the default one
+    """
+    if not verify_ssl:
+        import ssl
+        return ssl._create_unverified_context()
+    if ca_file:
+        import ssl
+        return ssl.create_default_context(cafile=ca_file)
+    return None
+
+
+def create_rate_limiter(max_rate, rate_file, hostname, port):
+    """ Returns:
+            a RateLimiter of max_rate requests per second, shared through
+            rate_file, by default a file per user, API hostname and port in
+            the system temp directory, or None without max_rate
+    """
+    if not max_rate:
+        return None
+    if rate_file is None:
+        import tempfile
+        # per user, as the file is only readable and writable by the user creating it
+        rate_file = os.path.join(tempfile.gettempdir(), "hawkular-alerts-{uid}-{hostname}-{port}.ratelimit".format(
+            uid=os.getuid(), hostname=hostname, port=port))
+    return RateLimiter(max_rate, rate_file)
+
+
+def load_library_module(module_name):
+    """ Imports one of the modules in the library directory, so plugins list
+        and compare exactly the way the modules do it
+    """
+    import importlib
+    if LIBRARY_PATH not in sys.path:
+        sys.path.insert(0, LIBRARY_PATH)
+    return importlib.import_module(module_name)
+
+
+class PluginModule(object):
+    """ Stands in for the AnsibleModule the module classes expect, raising
+        AnsibleError where a module would call fail_json
+    """
+    def fail_json(self, msg, **kwargs):
+        from ansible.errors import AnsibleError
+        raise AnsibleError(msg)
+
+    def log(self, msg):
+        pass
@@ -0,0 +1,15 @@
+# Adds this module_utils directory to the path of ansible.module_utils.
+#
+# Ansible ships the module_utils next to the library directory with the
+# modules, but they are not on the module_utils path of the controller, where
+# the plugins, the benchmarks and the tests import them from. Those load this
+# file by path, with imp.load_source, before importing
+# ansible.module_utils.hawkular_alerts
+
+import os
+
+import ansible.module_utils
+
+MODULE_UTILS_PATH = os.path.dirname(os.path.abspath(__file__))
+if MODULE_UTILS_PATH not in ansible.module_utils.__path__:
+    ansible.module_utils.__path__.append(MODULE_UTILS_PATH)
@@ -0,0 +1,174 @@
+""" In-memory fake of the hawkular alerts API, which the tests and the load
+    generator run the modules against
+"""
+
+import re
+import json
+import zlib
+import threading
+
+try:
+    from urllib import unquote_plus
+    from urlparse import parse_qs, urlparse
+    from BaseHTTPServer import HTTPServer, BaseHTTPRequestHandler
+    from SocketServer import ThreadingMixIn
+except ImportError:
+    from urllib.parse import parse_qs, unquote_plus, urlparse
+    from http.server import HTTPServer, BaseHTTPRequestHandler
+    from socketserver import ThreadingMixIn
+
+
+class FakeAlertsHandler(BaseHTTPRequestHandler):
+    """ In-memory fake of the parts of the alerts API the modules use, holding
+        the triggers of each tenant on the server. Gzip request bodies are
+        decompressed, and the responses are gzip compressed when the server
+        was started with gzip and the request accepts it
+    """
+    def log_message(self, *args):
+        pass
+
+    def reply(self, code, body=None):
+        data = json.dumps(body).encode('utf-8') if body is not None else b''
+        self.send_response(code)
+        self.send_header('Content-Type', 'application/json')
+        if data and self.server.gzip and 'gzip' in (self.headers.get('Accept-Encoding') or ''):
+            compressor = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+            data = compressor.compress(data) + compressor.flush()
+            self.send_header('Content-Encoding', 'gzip')
+            self.server.gzip_responses += 1
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def handle_request(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        data = self.rfile.read(length) if length else b''
+        if self.headers.get('Content-Encoding') == 'gzip':
+            data = zlib.decompress(data, 16 + zlib.MAX_WBITS)
+        body = json.loads(data.decode('utf-8')) if data else None
+        path = [unquote_plus(p) for p in re.sub(r'^/hawkular/alerts/', '', self.path.split('?')[0]).split('/')]
+        params = dict((key, values[0]) for key, values in parse_qs(urlparse(self.path).query).items())
+        method = self.command
+        with self.server.lock:
+            self.server.calls.append((method, '/'.join(path)))
+            if self.headers.get('Content-Encoding') == 'gzip':
+                self.server.gzip_requests.append(body)
+            tenant = self.server.tenants.setdefault(self.headers.get('Hawkular-Tenant'),
+                                                    dict(triggers={}, conditions={}, dampenings={}))
+            triggers, conditions, dampenings = tenant['triggers'], tenant['conditions'], tenant['dampenings']
+            if path == ['data'] and method == 'POST':
+                return self.reply(200)
+            if path == ['triggers'] and method == 'GET':
+                if 'page' not in params:
+                    return self.reply(200, list(triggers.values()))
+                page = list(triggers.values())
+                if params.get('sort') == 'id':
+                    page.sort(key=lambda t: t['id'], reverse=params.get('order') == 'desc')
+                per_page = int(params['per_page'])
+                start = int(params['page']) * per_page
+                return self.reply(200, page[start:start + per_page])
+            if path == ['triggers', 'groups'] and method == 'POST':
+                triggers[body['id']] = dict(body, type='GROUP')
+                return self.reply(200, triggers[body['id']])
+            if path == ['triggers', 'groups', 'members'] and method == 'POST':
+                if u'{0}'.format(body['memberId']) in triggers:
+                    return self.reply(400, {'errorMsg': 'Trigger already exists'})
+                # trigger ids are strings on the server, whatever the JSON type of the member id
+                member = dict(triggers[body['groupId']], id=u'{0}'.format(body['memberId']), name=body.get('memberName'),
+                              type='MEMBER', memberOf=body['groupId'], dataIdMap=body.get('dataIdMap'))
+                triggers[member['id']] = member
+                return self.reply(200, member)
+            if path[:2] == ['triggers', 'groups'] and len(path) == 3:
+                if path[2] not in triggers:
+                    return self.reply(404, {'errorMsg': 'Trigger not found'})
+                if method == 'PUT':
+                    triggers[path[2]].update(body)
+                    return self.reply(200)
+                if method == 'DELETE':
+                    keep = dict(MEMBER=params.get('keepNonOrphans') == 'true',
+                                ORPHAN=params.get('keepOrphans') == 'true')
+                    for member in [t for t in triggers.values() if t.get('memberOf') == path[2]]:
+                        if keep[member['type']]:
+                            member.update(type='STANDARD', memberOf=None)
+                        else:
+                            del triggers[member['id']]
+                    del triggers[path[2]]
+                    conditions.pop(path[2], None)
+                    dampenings.pop(path[2], None)
+                    return self.reply(200)
+            if path[:2] == ['triggers', 'groups'] and len(path) == 4 and path[3] == 'members' and method == 'GET':
+                if path[2] not in triggers:
+                    return self.reply(404, {'errorMsg': 'Trigger not found'})
+                types = ('MEMBER', 'ORPHAN') if params.get('includeOrphans') == 'true' else ('MEMBER',)
+                return self.reply(200, [t for t in triggers.values()
+                                        if t.get('memberOf') == path[2] and t['type'] in types])
+            if path[:3] == ['triggers', 'groups', 'members'] and len(path) == 5 and path[4] == 'orphan':
+                if path[3] not in triggers:
+                    return self.reply(404, {'errorMsg': 'Trigger not found'})
+                triggers[path[3]]['type'] = 'ORPHAN'
+                return self.reply(200)
+            if path[:2] == ['triggers', 'groups'] and len(path) == 5 and path[3] == 'conditions':
+                mode_conditions = [dict(c, triggerId=path[2], triggerMode=path[4]) for c in body['conditions']]
+                conditions[path[2]] = [c for c in conditions.get(path[2], [])
+                                       if c['triggerMode'] != path[4]] + mode_conditions
+                return self.reply(200, mode_conditions)
+            if path[:2] == ['triggers', 'groups'] and len(path) == 4 and path[3] == 'dampenings':
+                dampening = dict(body, triggerId=path[2], dampeningId='{0}-{1}'.format(path[2], body['triggerMode']))
+                dampenings.setdefault(path[2], {})[dampening['dampeningId']] = dampening
+                return self.reply(200, dampening)
+            if path[:2] == ['triggers', 'groups'] and len(path) == 5 and path[3] == 'dampenings':
+                if path[4] not in dampenings.get(path[2], {}):
+                    return self.reply(404, {'errorMsg': 'Dampening not found'})
+                if method == 'PUT':
+                    dampenings[path[2]][path[4]].update(body)
+                    return self.reply(200, dampenings[path[2]][path[4]])
+                if method == 'DELETE':
+                    del dampenings[path[2]][path[4]]
+                    return self.reply(200)
+            if path[0] == 'triggers' and len(path) == 2:
+                if path[1] not in triggers:
+                    return self.reply(404, {'errorMsg': 'Trigger not found'})
+                if method == 'GET':
+                    return self.reply(200, triggers[path[1]])
+                if method == 'DELETE':
+                    del triggers[path[1]]
+                    return self.reply(200)
+            if path[0] == 'triggers' and len(path) == 3 and path[2] in ('conditions', 'dampenings'):
+                if path[1] not in triggers:
+                    return self.reply(404, {'errorMsg': 'Trigger not found'})
+                if path[2] == 'conditions':
+                    return self.reply(200, conditions.get(path[1], []))
+                return self.reply(200, list(dampenings.get(path[1], {}).values()))
+        self.reply(404, {'errorMsg': 'Not supported by the fake server'})
+
+    do_GET = do_POST = do_PUT = do_DELETE = handle_request
+
+
+class FakeAlertsServer(ThreadingMixIn, HTTPServer):
+    """ The fake alerts server, recording the method and path of each request
+        in calls, the decompressed body of each gzip request in gzip_requests,
+        and counting the gzip responses in gzip_responses
+    """
+    daemon_threads = True
+    # the default backlog of 5 drops connections of concurrent operations
+    request_queue_size = 128
+
+    def __init__(self, address, gzip=False):
+        HTTPServer.__init__(self, address, FakeAlertsHandler)
+        self.gzip           = gzip
+        self.tenants        = {}
+        self.calls          = []
+        self.gzip_requests  = []
+        self.gzip_responses = 0
+        self.lock           = threading.Lock()
+
+
+def start_fake_server(gzip=False):
+    """ Returns:
+            the fake server, listening on a free local port
+    """
+    server = FakeAlertsServer(('127.0.0.1', 0), gzip)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    return server
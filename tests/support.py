@@ -0,0 +1,88 @@
+""" Shared setup of the tests: the module_utils path, the fake alerts server,
+    and running the modules in the test process
+
+    The modules use urllib2, Ansible and the hawkular client, so the tests run
+    with the python 2 interpreter the modules run with, and are skipped when
+    those are missing:
+
+        python2 -m unittest discover -s tests
+"""
+import io
+import os
+import sys
+import json
+import unittest
+
+try:
+    from urllib2 import HTTPError
+    import imp
+    from hawkular.client import HawkularMetricsError
+    from ansible.module_utils import basic
+except ImportError:
+    raise unittest.SkipTest("the modules run with python 2, Ansible and the hawkular client")
+
+ROOT_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+imp.load_source('hawkular_alerts_path', os.path.join(ROOT_PATH, 'module_utils', 'hawkular_alerts_path.py'))
+
+from ansible.module_utils.hawkular_alerts import create_client, load_library_module
+
+import fake_alerts
+
+TENANT = 'test'
+
+__all__ = ['HTTPError', 'HawkularMetricsError', 'ROOT_PATH', 'TENANT', 'create_client', 'fake_client',
+           'load_library_module', 'load_plugin', 'run_module', 'start_fake_server']
+
+
+def start_fake_server(test, gzip=False):
+    """ Starts a fake alerts server, shut down on the cleanup of test
+
+        Returns:
+            the fake server
+    """
+    server = fake_alerts.start_fake_server(gzip)
+    test.addCleanup(server.server_close)
+    test.addCleanup(server.shutdown)
+    return server
+
+
+def load_plugin(plugin_type, name):
+    """ Returns:
+            the plugin module name, loaded from the plugin_type directory,
+            such as action_plugins, as the name of an action plugin is also
+            the name of its library stub
+    """
+    return imp.load_source(name, os.path.join(ROOT_PATH, plugin_type, name + '.py'))
+
+
+def fake_client(server, **options):
+    """ Returns:
+            a module client of the TENANT tenant, sending its requests to server
+    """
+    return create_client(TENANT, host='127.0.0.1', port=server.server_address[1], scheme='http', token='token',
+                         **options)
+
+
+def run_module(module_name, server, **args):
+    """ Runs main() of the library module module_name against server, in the TENANT
+        tenant unless tenants are passed. The calls of server are cleared
+        first, so they only hold the requests of this run afterwards
+
+        Returns:
+            the result the module exited with
+    """
+    module_args = dict(hawkular_api_hostname='127.0.0.1', hawkular_api_port=server.server_address[1],
+                       hawkular_api_auth_token='token', scheme='http')
+    if 'tenants' not in args:
+        module_args['tenant'] = TENANT
+    module_args.update(args)
+    basic._ANSIBLE_ARGS = json.dumps({'ANSIBLE_MODULE_ARGS': module_args}).encode('utf-8')
+    del server.calls[:]
+    stdout, sys.stdout = sys.stdout, io.BytesIO()
+    try:
+        load_library_module(module_name).main()
+    except SystemExit:
+        pass
+    finally:
+        stdout, sys.stdout = sys.stdout, stdout
+    return json.loads(stdout.getvalue())
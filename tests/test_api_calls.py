@@ -0,0 +1,179 @@
+""" The number of requests each module run sends to the alerts API, counted by
+    the fake alerts server and reported in api_calls
+"""
+import unittest
+
+from support import run_module, start_fake_server
+
+TRIGGER = 'hawkular_alerts_group_trigger'
+MEMBER = 'hawkular_alerts_group_member'
+DAMPENING = 'hawkular_alerts_group_dampening'
+
+CONDITIONS = [
+    dict(name='cpu', trigger_mode='FIRING', type='THRESHOLD', data_id='cpu', operator='GT', threshold=0.8),
+    dict(name='cpu resolved', trigger_mode='AUTORESOLVE', type='THRESHOLD', data_id='cpu', operator='LT',
+         threshold=0.5),
+]
+
+
+class ApiCallsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.server = start_fake_server(self)
+
+    def run_module(self, module_name, **args):
+        args.setdefault('group_id', 'group-1')
+        result = run_module(module_name, self.server, **args)
+        self.assertFalse(result.get('failed'), result.get('msg'))
+        self.assertEqual(result['api_calls'], len(self.server.calls))
+        return result
+
+    def create_group_trigger(self, **args):
+        spec = dict(state='present', name='Group 1', severity='HIGH', conditions=CONDITIONS)
+        spec.update(args)
+        return self.run_module(TRIGGER, **spec)
+
+    def create_group_member(self, **args):
+        spec = dict(state='present', id='member-1', data_id_map={'cpu': 'member-1-cpu'})
+        spec.update(args)
+        return self.run_module(MEMBER, **spec)
+
+    def create_group_dampening(self, dampening=None, **args):
+        return self.run_module(DAMPENING, state='present',
+                               dampenings={'FIRING': dampening or dict(type='STRICT', eval_true_setting=3)}, **args)
+
+
+class GroupTriggerApiCallsTest(ApiCallsTest):
+
+    def test_create(self):
+        result = self.create_group_trigger()
+        self.assertTrue(result['changed'])
+        # get, create, the FIRING and AUTORESOLVE conditions and the fingerprint
+        self.assertEqual(result['api_calls'], 5)
+
+    def test_unchanged_fingerprint(self):
+        self.create_group_trigger()
+        result = self.create_group_trigger()
+        self.assertFalse(result['changed'])
+        self.assertEqual(result['api_calls'], 1)
+
+    def test_unchanged_force_compare(self):
+        self.create_group_trigger()
+        result = self.create_group_trigger(force_compare=True)
+        self.assertFalse(result['changed'])
+        # get and the conditions
+        self.assertEqual(result['api_calls'], 2)
+
+    def test_update(self):
+        self.create_group_trigger()
+        result = self.create_group_trigger(severity='LOW')
+        self.assertTrue(result['changed'])
+        # get, the conditions and the update, along with the fingerprint
+        self.assertEqual(result['api_calls'], 3)
+
+    def test_list(self):
+        self.create_group_trigger()
+        result = self.run_module(TRIGGER, state='list')
+        self.assertEqual([trigger['id'] for trigger in result['triggers']], ['group-1'])
+        self.assertEqual(result['api_calls'], 1)
+
+    def test_delete(self):
+        self.create_group_trigger()
+        result = self.run_module(TRIGGER, state='absent')
+        self.assertTrue(result['changed'])
+        self.assertEqual(result['api_calls'], 1)
+
+    def test_delete_missing(self):
+        result = self.run_module(TRIGGER, state='absent')
+        self.assertFalse(result['changed'])
+        self.assertEqual(result['api_calls'], 1)
+
+
+class GroupMemberApiCallsTest(ApiCallsTest):
+
+    def setUp(self):
+        super(GroupMemberApiCallsTest, self).setUp()
+        self.create_group_trigger()
+
+    def test_create(self):
+        result = self.create_group_member()
+        self.assertTrue(result['changed'])
+        # the member, the group trigger and the create
+        self.assertEqual(result['api_calls'], 3)
+
+    def test_unchanged(self):
+        self.create_group_member()
+        result = self.create_group_member()
+        self.assertFalse(result['changed'])
+        self.assertEqual(result['api_calls'], 1)
+
+    def test_list(self):
+        self.create_group_member()
+        result = self.run_module(MEMBER, state='list')
+        self.assertEqual([member['id'] for member in result['group_members']], ['member-1'])
+        # the group trigger and its members
+        self.assertEqual(result['api_calls'], 2)
+
+    def test_delete(self):
+        self.create_group_member()
+        result = self.run_module(MEMBER, state='absent', id='member-1')
+        self.assertTrue(result['changed'])
+        # the member and the delete
+        self.assertEqual(result['api_calls'], 2)
+
+    def test_delete_without_id(self):
+        result = run_module(MEMBER, self.server, state='absent', group_id='group-1')
+        self.assertTrue(result['failed'])
+        self.assertEqual(result['msg'], "state is absent but all of the following are missing: id")
+        self.assertEqual(self.server.calls, [])
+
+
+class GroupDampeningApiCallsTest(ApiCallsTest):
+
+    def setUp(self):
+        super(GroupDampeningApiCallsTest, self).setUp()
+        self.create_group_trigger()
+
+    def test_create(self):
+        result = self.create_group_dampening()
+        self.assertTrue(result['changed'])
+        # the group trigger, the dampenings, the create and the fingerprint
+        self.assertEqual(result['api_calls'], 4)
+
+    def test_unchanged_fingerprint(self):
+        self.create_group_dampening()
+        result = self.create_group_dampening()
+        self.assertFalse(result['changed'])
+        self.assertEqual(result['api_calls'], 1)
+
+    def test_unchanged_force_compare(self):
+        self.create_group_dampening()
+        result = self.create_group_dampening(force_compare=True)
+        self.assertFalse(result['changed'])
+        # the group trigger and the dampenings
+        self.assertEqual(result['api_calls'], 2)
+
+    def test_update(self):
+        self.create_group_dampening()
+        result = self.create_group_dampening(dict(type='STRICT', eval_true_setting=5))
+        self.assertTrue(result['changed'])
+        # the group trigger, the dampenings, the update and the fingerprint
+        self.assertEqual(result['api_calls'], 4)
+
+    def test_list(self):
+        self.create_group_dampening()
+        result = self.run_module(DAMPENING, state='list', dampenings={})
+        self.assertEqual(list(result['group_dampenings']), ['FIRING'])
+        # the group trigger and the dampenings
+        self.assertEqual(result['api_calls'], 2)
+
+    def test_delete(self):
+        self.create_group_dampening()
+        result = self.run_module(DAMPENING, state='absent', dampenings={'FIRING': {}})
+        self.assertTrue(result['changed'])
+        # the group trigger, the dampenings, the delete and the fingerprint removal
+        self.assertEqual(result['api_calls'], 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
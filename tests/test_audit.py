@@ -0,0 +1,176 @@
+""" The hawkular_alerts_audit action, run on the spec files it is given
+"""
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+
+from support import ROOT_PATH, TENANT, load_plugin, run_module, start_fake_server
+
+from ansible.parsing.dataloader import DataLoader
+from ansible.playbook.play import Play
+from ansible.playbook.play_context import PlayContext
+from ansible.plugins.loader import connection_loader, module_loader
+from ansible.template import Templar
+
+# the documentation stub of the action, to resolve the task action
+module_loader.add_directory(os.path.join(ROOT_PATH, 'library'))
+audit = load_plugin('action_plugins', 'hawkular_alerts_audit')
+
+TRIGGER = 'hawkular_alerts_group_trigger'
+MEMBER = 'hawkular_alerts_group_member'
+DAMPENING = 'hawkular_alerts_group_dampening'
+
+SPEC = '''
+groups:
+- group_id: group-1
+  name: Group 1
+  severity: {severity}
+  conditions:
+  - {{name: cpu, trigger_mode: FIRING, type: THRESHOLD, data_id: cpu, operator: GT, threshold: {threshold}}}
+  dampenings:
+    FIRING: {{type: STRICT, eval_true_setting: {eval_true_setting}}}
+  members:
+  - {{id: member-1}}
+  - {{id: {member}}}
+'''
+
+
+class AuditTest(unittest.TestCase):
+
+    def setUp(self):
+        self.server = start_fake_server(self)
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.spec_file = os.path.join(directory, 'spec.yml')
+
+    def run_audit(self, spec, **args):
+        with open(self.spec_file, 'w') as f:
+            f.write(spec)
+        loader = DataLoader()
+        # the action looks up the spec file from the task, which needs a play
+        play = Play.load(dict(hosts='localhost', gather_facts=False, tasks=[dict(hawkular_alerts_audit=dict())]),
+                         loader=loader)
+        task = play.get_tasks()[0][0]
+        task.args = dict(hawkular_api_hostname='127.0.0.1', hawkular_api_port=self.server.server_address[1],
+                         hawkular_api_auth_token='token', tenant=TENANT, spec_file=self.spec_file, scheme='http')
+        task.args.update(args)
+        del self.server.calls[:]
+        play_context = PlayContext()
+        connection = connection_loader.get('local', play_context, sys.stdin)
+        action = audit.ActionModule(task, connection, play_context, loader, Templar(loader), None)
+        return action.run(task_vars={})
+
+
+class AuditSpecTest(AuditTest):
+
+    def assert_invalid_spec(self, spec, msg):
+        result = self.run_audit(spec)
+        self.assertTrue(result['failed'])
+        self.assertEqual(result['msg'], msg.format(path=self.spec_file))
+        self.assertEqual(self.server.calls, [])
+
+    def test_empty_spec(self):
+        self.assert_invalid_spec('', "Spec file {path} must hold a mapping with a groups list")
+
+    def test_list_spec(self):
+        self.assert_invalid_spec('- group_id: group-1\n', "Spec file {path} must hold a mapping with a groups list")
+
+    def test_missing_groups(self):
+        self.assert_invalid_spec('tenant: test\n', "Spec file {path} must hold a mapping with a groups list")
+
+    def test_group_without_id(self):
+        self.assert_invalid_spec('groups:\n- name: Group 1\n',
+                                 "Each group of spec file {path} must be a mapping with a group_id")
+
+    def test_invalid_verify_ssl(self):
+        result = self.run_audit('groups: []\n', verify_ssl='maybe')
+        self.assertTrue(result['failed'])
+        self.assertEqual(result['msg'], "verify_ssl must be a boolean, got: maybe")
+
+    def test_verify_ssl_string(self):
+        result = self.run_audit('groups: []\n', verify_ssl='no')
+        self.assertFalse(result.get('failed'), result['msg'])
+        self.assertFalse(result['drift'])
+
+    def test_unmanaged_group(self):
+        run_module(TRIGGER, self.server, state='present', group_id='group-1', name='Group 1',
+                   severity='HIGH')
+        result = self.run_audit('groups: []\n')
+        self.assertFalse(result.get('failed'), result['msg'])
+        self.assertTrue(result['drift'])
+        self.assertEqual(result['unmanaged_groups'], ['group-1'])
+
+
+class AuditDriftTest(AuditTest):
+
+    def setUp(self):
+        super(AuditDriftTest, self).setUp()
+        run_module(TRIGGER, self.server, state='present', group_id='group-1', name='Group 1', severity='HIGH',
+                   conditions=[dict(name='cpu', trigger_mode='FIRING', type='THRESHOLD', data_id='cpu', operator='GT',
+                                    threshold=0.8)])
+        run_module(DAMPENING, self.server, state='present', group_id='group-1',
+                   dampenings={'FIRING': dict(type='STRICT', eval_true_setting=3)})
+        for member_id in ('member-1', 'member-2'):
+            run_module(MEMBER, self.server, state='present', group_id='group-1', id=member_id,
+                       data_id_map={'cpu': member_id + '-cpu'})
+
+    def audit_spec(self, **values):
+        spec = dict(severity='HIGH', threshold=0.8, eval_true_setting=3, member='member-2')
+        spec.update(values)
+        result = self.run_audit(SPEC.format(**spec))
+        self.assertFalse(result.get('failed'), result['msg'])
+        self.assertEqual(result['unmanaged_groups'], [])
+        return result
+
+    def assert_drift(self, result, group_differences):
+        self.assertTrue(result['drift'])
+        self.assertEqual(result['differences'], {'group-1': group_differences})
+        self.assertEqual(result['msg'], "Found drift in 1 of 1 groups")
+
+    def test_no_drift(self):
+        result = self.audit_spec()
+        self.assertFalse(result['drift'])
+        self.assertEqual(result['differences'], {})
+        self.assertEqual(result['msg'], "No drift found in 1 groups")
+        # the audit only reads
+        self.assertEqual(set(method for method, path in self.server.calls), set(['GET']))
+
+    def test_trigger_updates(self):
+        result = self.audit_spec(severity='LOW')
+        self.assert_drift(result, dict(trigger_updates={'severity': 'LOW'}))
+
+    def test_conditions(self):
+        result = self.audit_spec(threshold=0.9)
+        self.assert_drift(result, dict(conditions=True))
+
+    def test_dampening_update_required(self):
+        result = self.audit_spec(eval_true_setting=5)
+        self.assert_drift(result, dict(dampenings={'FIRING': 'update required'}))
+
+    def test_dampening_missing(self):
+        self.server.tenants[TENANT]['dampenings'].clear()
+        result = self.audit_spec()
+        self.assert_drift(result, dict(dampenings={'FIRING': 'missing'}))
+
+    def test_members(self):
+        result = self.audit_spec(member='member-3')
+        self.assert_drift(result, dict(missing_members=['member-3'], unmanaged_members=['member-2']))
+
+    def test_missing_group(self):
+        result = self.run_audit('groups:\n- group_id: group-1\n- group_id: group-2\n')
+        self.assertFalse(result.get('failed'), result['msg'])
+        self.assertEqual(result['differences'], {'group-2': dict(missing=True)})
+        self.assertEqual(result['msg'], "Found drift in 1 of 2 groups")
+
+    def test_error(self):
+        # a condition without a name fails the comparison of the conditions
+        result = self.run_audit('groups:\n- group_id: group-1\n  conditions:\n  - {type: THRESHOLD}\n')
+        self.assertTrue(result['failed'])
+        self.assertEqual(result['msg'], "Failed to audit some of the groups")
+        self.assertIn('error', result['differences']['group-1'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+""" Deleting lists of group triggers, with their member and orphan triggers
+"""
+import unittest
+
+from support import TENANT, fake_client, run_module, start_fake_server
+
+TRIGGER = 'hawkular_alerts_group_trigger'
+MEMBER = 'hawkular_alerts_group_member'
+
+
+class DeleteGroupTriggersTest(unittest.TestCase):
+
+    def setUp(self):
+        self.server = start_fake_server(self)
+        run_module(TRIGGER, self.server, state='present', group_id='group-1', name='Group 1', severity='HIGH')
+        for member_id in ('member-1', 'member-2'):
+            run_module(MEMBER, self.server, state='present', group_id='group-1', id=member_id,
+                       data_id_map={'cpu': member_id + '-cpu'})
+        client = fake_client(self.server)
+        client._put(client._service_url(['triggers', 'groups', 'members', 'member-2', 'orphan']), {},
+                    parse_json=False)
+
+    @property
+    def triggers(self):
+        return self.server.tenants[TENANT]['triggers']
+
+    def delete_group_triggers(self, **args):
+        return run_module(TRIGGER, self.server, state='absent', group_ids=['group-1', 'missing'], **args)
+
+    def test_delete(self):
+        result = self.delete_group_triggers()
+        self.assertTrue(result['changed'])
+        self.assertEqual(result['results']['group-1'],
+                         dict(msg="Successfully deleted group trigger group-1", changed=True, members_deleted=2,
+                              members_kept=0))
+        self.assertEqual(self.triggers, {})
+
+    def test_keep_non_orphans(self):
+        result = self.delete_group_triggers(keep_non_orphans=True)
+        self.assertEqual(result['results']['group-1']['members_deleted'], 1)
+        self.assertEqual(result['results']['group-1']['members_kept'], 1)
+        self.assertEqual(list(self.triggers), ['member-1'])
+        self.assertEqual(self.triggers['member-1']['type'], 'STANDARD')
+
+    def test_missing_group_trigger(self):
+        result = self.delete_group_triggers()
+        self.assertFalse(result.get('failed'), result['msg'])
+        self.assertEqual(result['results']['missing'],
+                         dict(msg="Group trigger missing doesn't exist", changed=False, members_deleted=0,
+                              members_kept=0))
+
+    def test_idempotent(self):
+        self.delete_group_triggers()
+        result = self.delete_group_triggers()
+        self.assertFalse(result.get('failed'), result['msg'])
+        self.assertFalse(result['changed'])
+        # the members listing of each group trigger
+        self.assertEqual(result['api_calls'], 2)
+
+    def test_options_at_least_one(self):
+        for arg in ('delete_concurrency', 'delete_batch_size'):
+            result = self.delete_group_triggers(**{arg: 0})
+            self.assertTrue(result['failed'])
+            self.assertEqual(result['msg'], "{arg} must be at least 1, got: 0".format(arg=arg))
+            self.assertEqual(self.server.calls, [])
+        self.assertIn('group-1', self.triggers)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+""" The spec fingerprints of group triggers and dampenings, stored on group
+    triggers applied before the fingerprints
+"""
+import unittest
+
+from support import TENANT, run_module, start_fake_server
+
+TRIGGER = 'hawkular_alerts_group_trigger'
+DAMPENING = 'hawkular_alerts_group_dampening'
+
+DAMPENINGS = {'FIRING': dict(type='STRICT', eval_true_setting=3)}
+
+
+class FingerprintTest(unittest.TestCase):
+
+    def setUp(self):
+        self.server = start_fake_server(self)
+        self.create_group_trigger()
+
+    def create_group_trigger(self):
+        return run_module(TRIGGER, self.server, state='present', group_id='group-1', name='Group 1', severity='HIGH')
+
+    def create_group_dampenings(self):
+        return run_module(DAMPENING, self.server, state='present', group_id='group-1', dampenings=DAMPENINGS)
+
+    def drop_fingerprints(self):
+        self.server.tenants[TENANT]['triggers']['group-1']['context'] = {}
+
+    def test_group_trigger_fingerprint_stored(self):
+        self.drop_fingerprints()
+        result = self.create_group_trigger()
+        self.assertTrue(result['changed'])
+        self.assertTrue(result['fingerprint_stored'])
+        self.assertEqual(self.server.calls[-1], ('PUT', 'triggers/groups/group-1'))
+        result = self.create_group_trigger()
+        self.assertFalse(result['changed'])
+        self.assertEqual(result['api_calls'], 1)
+
+    def test_group_trigger_fingerprint_already_stored(self):
+        result = run_module(TRIGGER, self.server, state='present', group_id='group-1', name='Group 1',
+                            severity='HIGH', force_compare=True)
+        self.assertFalse(result['changed'])
+        self.assertFalse(result['fingerprint_stored'])
+
+    def test_dampenings_fingerprint_stored(self):
+        self.create_group_dampenings()
+        self.drop_fingerprints()
+        result = self.create_group_dampenings()
+        self.assertTrue(result['changed'])
+        self.assertTrue(result['fingerprint_stored'])
+        result = self.create_group_dampenings()
+        self.assertFalse(result['changed'])
+        self.assertEqual(result['api_calls'], 1)
+
+    def test_dampenings_fingerprint_removed(self):
+        self.create_group_dampenings()
+        self.server.tenants[TENANT]['dampenings'].clear()
+        result = run_module(DAMPENING, self.server, state='absent', group_id='group-1', dampenings={'FIRING': {}})
+        self.assertTrue(result['changed'])
+        self.assertEqual(self.server.calls[-1], ('PUT', 'triggers/groups/group-1'))
+
+    def test_fingerprints_are_kept_apart(self):
+        self.create_group_dampenings()
+        result = self.create_group_trigger()
+        self.assertEqual(result['api_calls'], 1)
+        result = self.create_group_dampenings()
+        self.assertEqual(result['api_calls'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+""" Creating the group members of member_ids, expanded from templates
+"""
+import unittest
+
+from support import TENANT, fake_client, run_module, start_fake_server
+
+TRIGGER = 'hawkular_alerts_group_trigger'
+MEMBER = 'hawkular_alerts_group_member'
+
+CONDITIONS = [dict(name='cpu', trigger_mode='FIRING', type='THRESHOLD', data_id='cpu', operator='GT', threshold=0.8)]
+
+
+class GroupMembersTest(unittest.TestCase):
+
+    def setUp(self):
+        self.server = start_fake_server(self)
+        run_module(TRIGGER, self.server, state='present', group_id='group-1', name='Group 1', severity='HIGH',
+                   conditions=CONDITIONS)
+
+    def create_group_members(self, member_ids):
+        result = run_module(MEMBER, self.server, state='present', group_id='group-1', member_ids=member_ids,
+                            data_id_map_template='{data_id}-{member_id}', name='Member {member_id}')
+        self.assertFalse(result.get('failed'), result['msg'])
+        return result
+
+    def test_create(self):
+        result = self.create_group_members(['node-1', 'node-2'])
+        self.assertTrue(result['changed'])
+        self.assertEqual(sorted(result['created']), ['node-1', 'node-2'])
+        member = self.server.tenants[TENANT]['triggers']['node-1']
+        self.assertEqual(member['dataIdMap'], {'cpu': 'cpu-node-1'})
+        self.assertEqual(member['name'], 'Member node-1')
+
+    def test_existing(self):
+        self.create_group_members(['node-1'])
+        result = self.create_group_members(['node-1', 'node-2'])
+        self.assertEqual(result['created'], ['node-2'])
+        self.assertEqual(result['msg'], "Successfully created 1 group members, 1 already exist in group group-1")
+
+    def test_numeric_ids(self):
+        self.create_group_members([1, 2])
+        result = self.create_group_members([1, 2])
+        self.assertFalse(result['changed'])
+        self.assertEqual(result['msg'], "Successfully created 0 group members, 2 already exist in group group-1")
+
+    def test_duplicate_ids(self):
+        result = self.create_group_members(['node-1', 'node-2', 'node-1'])
+        self.assertEqual(sorted(result['created']), ['node-1', 'node-2'])
+        self.assertEqual(result['msg'], "Successfully created 2 group members, 0 already exist in group group-1")
+        result = self.create_group_members(['node-1', 'node-1'])
+        self.assertEqual(result['msg'], "Successfully created 0 group members, 1 already exist in group group-1")
+
+    def test_orphan_members(self):
+        self.create_group_members(['node-1'])
+        client = fake_client(self.server)
+        client._put(client._service_url(['triggers', 'groups', 'members', 'node-1', 'orphan']), {}, parse_json=False)
+        result = self.create_group_members(['node-1', 'node-2'])
+        self.assertEqual(result['created'], ['node-2'])
+        self.assertEqual(result['msg'], "Successfully created 1 group members, 1 already exist in group group-1")
+
+    def test_member_concurrency_at_least_one(self):
+        result = run_module(MEMBER, self.server, state='present', group_id='group-1', member_ids=['node-1'],
+                            data_id_map_template='{data_id}-{member_id}', member_concurrency=0)
+        self.assertTrue(result['failed'])
+        self.assertEqual(result['msg'], "member_concurrency must be at least 1, got: 0")
+        self.assertEqual(self.server.calls, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+""" Round trips of the gzip content encodings of the module client through the
+    fake alerts server
+"""
+import unittest
+
+from support import HawkularMetricsError, fake_client, start_fake_server
+
+
+class GzipTest(unittest.TestCase):
+
+    def setUp(self):
+        self.server = start_fake_server(self, gzip=True)
+
+    def create_group_trigger(self, client, name='Group 1'):
+        return client._post(client._service_url(['triggers', 'groups']), {'id': 'group-1', 'name': name})
+
+    def test_gzip_response(self):
+        client = fake_client(self.server)
+        self.create_group_trigger(client)
+        trigger = client.get_trigger('group-1')
+        self.assertEqual(trigger.name, 'Group 1')
+        self.assertEqual(self.server.gzip_responses, 2)
+
+    def test_gzip_error_body(self):
+        client = fake_client(self.server)
+        with self.assertRaises(HawkularMetricsError) as raised:
+            client.get_trigger('missing')
+        self.assertEqual(raised.exception.code, 404)
+        self.assertEqual(raised.exception.msg, 'Trigger not found')
+        self.assertEqual(self.server.gzip_responses, 1)
+
+    def test_gzip_request_body(self):
+        client = fake_client(self.server, gzip_request_min_size=0)
+        trigger = self.create_group_trigger(client, name=u'Gruppe \u00fc')
+        self.assertEqual(self.server.gzip_requests, [{'id': 'group-1', 'name': u'Gruppe \u00fc'}])
+        self.assertEqual(trigger['name'], u'Gruppe \u00fc')
+
+    def test_small_request_body_is_not_compressed(self):
+        client = fake_client(self.server, gzip_request_min_size=1024)
+        self.create_group_trigger(client)
+        self.assertEqual(self.server.gzip_requests, [])
+        self.assertEqual(client.get_trigger('group-1').name, 'Group 1')
+
+    def test_identity_response_without_accept_gzip(self):
+        client = fake_client(self.server, accept_gzip=False)
+        self.create_group_trigger(client)
+        self.assertEqual(client.get_trigger('group-1').name, 'Group 1')
+        self.assertEqual(self.server.gzip_responses, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+""" The hawkular_members inventory, served from the inventory cache on repeated
+    runs
+"""
+import os
+import shutil
+import tempfile
+import unittest
+
+from support import ROOT_PATH, TENANT, run_module, start_fake_server
+
+from ansible.inventory.data import InventoryData
+from ansible.parsing.dataloader import DataLoader
+from ansible.plugins.loader import inventory_loader
+
+inventory_loader.add_directory(os.path.join(ROOT_PATH, 'inventory_plugins'))
+
+CONFIG = '''
+plugin: hawkular_members
+hawkular_api_hostname: 127.0.0.1
+hawkular_api_port: {port}
+hawkular_api_auth_token: token
+scheme: http
+tenant: {tenant}
+group_ids: [group-1]
+cache: yes
+cache_plugin: jsonfile
+cache_connection: {cache_connection}
+cache_timeout: 600
+'''
+
+
+class InventoryTest(unittest.TestCase):
+
+    def setUp(self):
+        self.server = start_fake_server(self)
+        run_module('hawkular_alerts_group_trigger', self.server, state='present', group_id='group-1', name='Group 1',
+                   severity='HIGH')
+        for member_id in ('member-1', 'member-2'):
+            run_module('hawkular_alerts_group_member', self.server, state='present', group_id='group-1',
+                       id=member_id, data_id_map={'cpu': member_id + '-cpu'})
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.path = os.path.join(directory, 'test.hawkular_members.yml')
+        with open(self.path, 'w') as f:
+            f.write(CONFIG.format(port=self.server.server_address[1], tenant=TENANT,
+                                  cache_connection=os.path.join(directory, 'cache')))
+
+    def parse(self, cache=True):
+        """ Parses the inventory configuration with a new plugin object, and
+            writes the cache as the inventory manager does
+
+            Returns:
+                the inventory data
+        """
+        del self.server.calls[:]
+        inventory = InventoryData()
+        plugin = inventory_loader.get('hawkular_members')
+        self.assertTrue(plugin.verify_file(self.path))
+        plugin.parse(inventory, DataLoader(), self.path, cache=cache)
+        plugin.update_cache_if_changed()
+        return inventory
+
+    def test_members(self):
+        inventory = self.parse()
+        self.assertEqual(sorted(host.name for host in inventory.groups['group_1'].get_hosts()),
+                         ['member-1', 'member-2'])
+        self.assertEqual(inventory.get_host('member-1').vars['hawkular_trigger']['member_of'], 'group-1')
+
+    def test_cached(self):
+        self.parse()
+        self.assertEqual(len(self.server.calls), 2)
+        inventory = self.parse()
+        self.assertEqual(self.server.calls, [])
+        self.assertEqual(sorted(inventory.hosts), ['member-1', 'member-2'])
+
+    def test_refresh_cache(self):
+        self.parse()
+        run_module('hawkular_alerts_group_member', self.server, state='absent', group_id='group-1', id='member-2')
+        inventory = self.parse(cache=False)
+        self.assertEqual(sorted(inventory.hosts), ['member-1'])
+        # the refreshed members are cached
+        inventory = self.parse()
+        self.assertEqual(self.server.calls, [])
+        self.assertEqual(sorted(inventory.hosts), ['member-1'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+""" Listing triggers and group members to a JSON lines file with output_path
+"""
+import os
+import json
+import shutil
+import tempfile
+import unittest
+
+from support import run_module, start_fake_server
+
+TRIGGER = 'hawkular_alerts_group_trigger'
+MEMBER = 'hawkular_alerts_group_member'
+
+
+class ListOutputTest(unittest.TestCase):
+
+    def setUp(self):
+        self.server = start_fake_server(self)
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.output_path = os.path.join(directory, 'list.jsonl')
+
+    def create_group_triggers(self, count):
+        for i in range(count):
+            run_module(TRIGGER, self.server, state='present', group_id='group-{0}'.format(i), name='Group',
+                       severity='LOW')
+
+    def list_triggers(self, **args):
+        # the module requires a group_id on list too
+        return run_module(TRIGGER, self.server, state='list', group_id='group-0', **args)
+
+    def read_output(self):
+        with open(self.output_path) as f:
+            return [json.loads(line) for line in f]
+
+    def test_triggers_pages(self):
+        self.create_group_triggers(5)
+        result = self.list_triggers(output_path=self.output_path, page_size=2)
+        self.assertEqual(result['count'], 5)
+        self.assertEqual(self.server.calls, [('GET', 'triggers')] * 3)
+        self.assertEqual([trigger['id'] for trigger in self.read_output()],
+                         ['group-{0}'.format(i) for i in range(5)])
+
+    def test_triggers_last_page_empty(self):
+        self.create_group_triggers(4)
+        result = self.list_triggers(output_path=self.output_path, page_size=2)
+        self.assertEqual(result['count'], 4)
+        self.assertEqual(result['api_calls'], 3)
+
+    def test_triggers_page_size_at_least_one(self):
+        result = self.list_triggers(output_path=self.output_path, page_size=0)
+        self.assertTrue(result['failed'])
+        self.assertEqual(result['msg'], "page_size must be at least 1, got: 0")
+        self.assertEqual(self.server.calls, [])
+
+    def test_triggers_write_error(self):
+        self.create_group_triggers(1)
+        result = self.list_triggers(output_path=os.path.dirname(self.output_path))
+        self.assertTrue(result['failed'])
+        self.assertTrue(result['msg'].startswith("Failed to write triggers"), result['msg'])
+
+    def test_group_members(self):
+        self.create_group_triggers(1)
+        run_module(MEMBER, self.server, state='present', group_id='group-0', id='member-1',
+                   data_id_map={'cpu': 'member-1-cpu'})
+        result = run_module(MEMBER, self.server, state='list', group_id='group-0', output_path=self.output_path)
+        self.assertEqual(result['count'], 1)
+        self.assertEqual([member['member_of'] for member in self.read_output()], ['group-0'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+""" The hawkular_triggers lookup, served from its cache plugin on repeated
+    lookups
+"""
+import time
+import shutil
+import tempfile
+import unittest
+
+from support import TENANT, load_plugin, run_module, start_fake_server
+
+from ansible.parsing.dataloader import DataLoader
+from ansible.plugins import cache as cache_plugins
+
+hawkular_triggers = load_plugin('lookup_plugins', 'hawkular_triggers')
+
+
+class LookupTest(unittest.TestCase):
+
+    def setUp(self):
+        self.server = start_fake_server(self)
+        hawkular_triggers.CACHES.clear()
+        for group_id in ('group-1', 'group-2'):
+            run_module('hawkular_alerts_group_trigger', self.server, state='present', group_id=group_id,
+                       name='Group', severity='HIGH')
+        run_module('hawkular_alerts_group_member', self.server, state='present', group_id='group-1', id='member-1',
+                   data_id_map={'cpu': 'member-1-cpu'})
+        del self.server.calls[:]
+
+    def lookup(self, *terms, **args):
+        options = dict(hawkular_api_hostname='127.0.0.1', hawkular_api_port=self.server.server_address[1],
+                       hawkular_api_auth_token='token', tenant=TENANT, scheme='http', cache_plugin='memory')
+        options.update(args)
+        # a new lookup object, as Ansible creates one for each lookup
+        return hawkular_triggers.LookupModule(loader=DataLoader()).run(list(terms), variables={}, **options)
+
+    def test_triggers(self):
+        results = self.lookup()
+        self.assertEqual(sorted(trigger['id'] for trigger in results), ['group-1', 'group-2', 'member-1'])
+
+    def test_group_members(self):
+        results = self.lookup('group-1')
+        self.assertEqual([member['id'] for member in results], ['member-1'])
+
+    def test_repeated_lookup(self):
+        results = self.lookup('group-1')
+        calls = len(self.server.calls)
+        self.assertEqual(self.lookup('group-1'), results)
+        self.assertEqual(len(self.server.calls), calls)
+        # other terms are another cache key
+        self.lookup('group-2')
+        self.assertGreater(len(self.server.calls), calls)
+
+    def test_expired(self):
+        self.lookup('group-1', cache_timeout=60)
+        calls = len(self.server.calls)
+        cache = hawkular_triggers.CACHES[('memory', None, 60)]
+        for key in cache.keys():
+            cache.get(key)['time'] = time.time() - 61
+        self.lookup('group-1', cache_timeout=60)
+        self.assertEqual(len(self.server.calls), 2 * calls)
+
+    def test_cache_disabled(self):
+        self.lookup('group-1', cache_timeout=0)
+        calls = len(self.server.calls)
+        self.lookup('group-1', cache_timeout=0)
+        self.assertEqual(len(self.server.calls), 2 * calls)
+
+    def test_jsonfile_cache(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        warnings = []
+        cache_plugins.display.warning = warnings.append
+        self.addCleanup(delattr, cache_plugins.display, 'warning')
+
+        results = self.lookup('group-1', cache_plugin='jsonfile', cache_connection=directory)
+        self.assertEqual(warnings, [])
+        calls = len(self.server.calls)
+        # another process, with a new cache plugin instance, reads the cache file
+        hawkular_triggers.CACHES.clear()
+        self.assertEqual(self.lookup('group-1', cache_plugin='jsonfile', cache_connection=directory), results)
+        self.assertEqual(len(self.server.calls), calls)
+
+
+if __name__ == '__main__':
+    unittest.main()
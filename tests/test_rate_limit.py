@@ -0,0 +1,63 @@
+""" The request rate limit, shared through its bucket file by the module
+    processes
+"""
+import os
+import time
+import shutil
+import tempfile
+import unittest
+import multiprocessing
+
+from support import TENANT, run_module, start_fake_server
+
+from ansible.module_utils.hawkular_alerts import RateLimiter, create_rate_limiter
+
+TRIGGER = 'hawkular_alerts_group_trigger'
+
+
+def take_tokens(rate, path, count):
+    limiter = RateLimiter(rate, path)
+    for _ in range(count):
+        limiter.acquire()
+
+
+class RateLimitTest(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.rate_file = os.path.join(directory, 'bucket.ratelimit')
+
+    def test_shared_by_processes(self):
+        rate, count = 20.0, 20
+        processes = [multiprocessing.Process(target=take_tokens, args=(rate, self.rate_file, count))
+                     for _ in range(2)]
+        start = time.time()
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+        elapsed = time.time() - start
+        self.assertEqual([process.exitcode for process in processes], [0, 0])
+        # a burst of rate tokens, then the other tokens of both processes at rate
+        self.assertGreaterEqual(elapsed, (2 * count - rate) / rate * 0.9)
+
+    def test_default_file_per_user(self):
+        limiter = create_rate_limiter(10, None, 'hawkular.example.com', 443)
+        self.assertEqual(os.path.basename(limiter.path),
+                         'hawkular-alerts-{uid}-hawkular.example.com-443.ratelimit'.format(uid=os.getuid()))
+
+    def test_limiter_error_fails_module(self):
+        server = start_fake_server(self)
+        rate_file = os.path.join(self.rate_file, 'missing', 'bucket.ratelimit')
+        for args in (dict(tenant=TENANT), dict(tenants=[TENANT, 'other'])):
+            result = run_module(TRIGGER, server, state='list', group_id='group-1', max_requests_per_second=10,
+                                rate_limit_file=rate_file, **args)
+            self.assertTrue(result['failed'])
+            self.assertEqual(server.calls, [])
+        self.assertIn("Failed to acquire the request rate limit of {path}".format(path=rate_file),
+                      result['results'][TENANT]['msg'])
+
+
+if __name__ == '__main__':
+    unittest.main()
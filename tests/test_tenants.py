@@ -0,0 +1,63 @@
+""" Applying the same state to several tenants concurrently with tenants
+"""
+import unittest
+
+from support import run_module, start_fake_server
+
+TRIGGER = 'hawkular_alerts_group_trigger'
+MEMBER = 'hawkular_alerts_group_member'
+DAMPENING = 'hawkular_alerts_group_dampening'
+
+TENANTS = ['tenant-1', 'tenant-2', 'tenant-3']
+
+
+class TenantsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.server = start_fake_server(self)
+
+    def create_group_trigger(self, tenants):
+        return run_module(TRIGGER, self.server, state='present', tenants=tenants, group_id='group-1',
+                          name='Group 1', severity='HIGH')
+
+    def test_results_by_tenant(self):
+        result = self.create_group_trigger(TENANTS)
+        self.assertFalse(result.get('failed'), result['msg'])
+        self.assertTrue(result['changed'])
+        self.assertEqual(sorted(result['results']), TENANTS)
+        for tenant in TENANTS:
+            self.assertTrue(result['results'][tenant]['changed'])
+            self.assertIn('group-1', self.server.tenants[tenant]['triggers'])
+
+    def test_client_per_tenant(self):
+        result = self.create_group_trigger(TENANTS)
+        # each client counts the requests of its own tenant only: get, create and the fingerprint
+        self.assertEqual([result['results'][tenant]['api_calls'] for tenant in TENANTS], [3, 3, 3])
+        self.assertEqual(len(self.server.calls), 9)
+
+    def test_failed_tenant(self):
+        self.create_group_trigger(TENANTS[:2])
+        result = run_module(DAMPENING, self.server, state='present', tenants=TENANTS, group_id='group-1',
+                            dampenings={'FIRING': dict(type='STRICT', eval_true_setting=3)})
+        self.assertTrue(result['failed'])
+        self.assertEqual(result['msg'], "Failed to reconcile tenants: tenant-3")
+        self.assertTrue(result['changed'])
+        self.assertIn("Group trigger group-1 does not exist", result['results']['tenant-3']['msg'])
+        # the other tenants still ran
+        for tenant in TENANTS[:2]:
+            self.assertTrue(result['results'][tenant]['changed'])
+            self.assertEqual(len(self.server.tenants[tenant]['dampenings']['group-1']), 1)
+
+    def test_tenant_concurrency_at_least_one(self):
+        for module_name, args in [(TRIGGER, dict(state='list')),
+                                  (MEMBER, dict(state='list')),
+                                  (DAMPENING, dict(state='list', dampenings={}))]:
+            result = run_module(module_name, self.server, tenants=TENANTS, group_id='group-1', tenant_concurrency=0,
+                                **args)
+            self.assertTrue(result['failed'])
+            self.assertEqual(result['msg'], "tenant_concurrency must be at least 1, got: 0")
+            self.assertEqual(self.server.calls, [])
+
+
+if __name__ == '__main__':
+    unittest.main()